@@ -20,8 +20,10 @@ config = context.config
 fileConfig(config.config_file_name)
 
 from app.models import Base  # noqa: E402
+from app.models import import_job  # noqa: F401,E402
 from app.models import invitation  # noqa: F401,E402
 from app.models import invitation_response  # noqa: F401,E402
+from app.models import invitation_stats  # noqa: F401,E402
 from app.models import template  # noqa: F401,E402
 from app.models import user  # noqa: F401,E402
 
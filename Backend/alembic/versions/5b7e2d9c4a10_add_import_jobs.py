@@ -0,0 +1,52 @@
+"""add import_jobs
+
+Revision ID: 5b7e2d9c4a10
+Revises: 3f1c7a9b1c2d
+Create Date: 2026-10-18
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5b7e2d9c4a10"
+down_revision = "3f1c7a9b1c2d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("template_id", sa.UUID(), nullable=False),
+        sa.Column("invitation_status", sa.String(length=16), nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("file_path", sa.String(length=1024), nullable=False),
+        sa.Column(
+            "state",
+            sa.Enum("QUEUED", "RUNNING", "COMPLETED", "FAILED", name="importjobstate"),
+            nullable=False,
+        ),
+        sa.Column("last_row", sa.Integer(), nullable=False),
+        sa.Column("rows_processed", sa.Integer(), nullable=False),
+        sa.Column("created", sa.Integer(), nullable=False),
+        sa.Column("skipped", sa.Integer(), nullable=False),
+        sa.Column("error_count", sa.Integer(), nullable=False),
+        sa.Column("errors", sa.JSON(), nullable=False),
+        sa.Column("detail", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["template_id"], ["invitation_templates.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_import_jobs_state", "import_jobs", ["state"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_jobs_state", table_name="import_jobs")
+    op.drop_table("import_jobs")
+    op.execute("DROP TYPE IF EXISTS importjobstate")
@@ -0,0 +1,30 @@
+"""add invitations.updated_at
+
+Revision ID: 8e4a1c6f2b37
+Revises: 5b7e2d9c4a10
+Create Date: 2026-10-18
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8e4a1c6f2b37"
+down_revision = "5b7e2d9c4a10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "invitations",
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+    )
+    op.execute("UPDATE invitations SET updated_at = created_at")
+
+
+def downgrade() -> None:
+    op.drop_column("invitations", "updated_at")
@@ -0,0 +1,77 @@
+"""store template content once; invitation columns become overrides
+
+Revision ID: a3e9d6c1f470
+Revises: f1b6d3e8a527
+Create Date: 2026-10-18
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a3e9d6c1f470"
+down_revision = "f1b6d3e8a527"
+branch_labels = None
+depends_on = None
+
+NOT_NULL_COLUMNS = {
+    "title": sa.String(length=255),
+    "company_name": sa.String(length=255),
+    "content": sa.Text(),
+    "event_time": sa.DateTime(),
+    "event_location": sa.String(length=255),
+}
+
+
+def upgrade() -> None:
+    for name, type_ in NOT_NULL_COLUMNS.items():
+        op.alter_column("invitations", name, existing_type=type_, nullable=True)
+
+    # JSON null and SQL NULL were both "no schedule"; NULL now means "inherit".
+    op.execute("UPDATE invitations SET schedule = NULL WHERE schedule::text = 'null'")
+
+    # Drop every value that merely repeats the linked template. Where an
+    # invitation had no map URL or schedule but its template has one, store the
+    # explicit empty value so it keeps showing none.
+    op.execute(
+        """
+        UPDATE invitations AS i SET
+          title = NULLIF(i.title, t.title),
+          company_name = NULLIF(i.company_name, t.company_name),
+          content = NULLIF(i.content, t.content),
+          event_time = CASE WHEN i.event_time IS NOT DISTINCT FROM t.event_time THEN NULL ELSE i.event_time END,
+          event_location = CASE WHEN i.event_location IS NOT DISTINCT FROM t.event_location THEN NULL ELSE i.event_location END,
+          google_map_url = CASE
+            WHEN i.google_map_url IS NOT DISTINCT FROM t.google_map_url THEN NULL
+            WHEN i.google_map_url IS NULL THEN ''
+            ELSE i.google_map_url END,
+          schedule = CASE
+            WHEN i.schedule::jsonb IS NOT DISTINCT FROM NULLIF(t.schedule::jsonb, 'null'::jsonb) THEN NULL
+            WHEN i.schedule IS NULL THEN '[]'::json
+            ELSE i.schedule END
+        FROM invitation_templates AS t
+        WHERE i.template_id = t.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        UPDATE invitations AS i SET
+          title = COALESCE(i.title, t.title),
+          company_name = COALESCE(i.company_name, t.company_name),
+          content = COALESCE(i.content, t.content),
+          event_time = COALESCE(i.event_time, t.event_time),
+          event_location = COALESCE(i.event_location, t.event_location),
+          google_map_url = NULLIF(COALESCE(i.google_map_url, t.google_map_url), ''),
+          schedule = COALESCE(i.schedule, t.schedule)
+        FROM invitation_templates AS t
+        WHERE i.template_id = t.id
+        """
+    )
+    for name, type_ in NOT_NULL_COLUMNS.items():
+        op.alter_column("invitations", name, existing_type=type_, nullable=False)
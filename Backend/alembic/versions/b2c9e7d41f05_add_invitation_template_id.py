@@ -0,0 +1,54 @@
+"""add invitations.template_id
+
+Revision ID: b2c9e7d41f05
+Revises: 8e4a1c6f2b37
+Create Date: 2026-10-18
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b2c9e7d41f05"
+down_revision = "8e4a1c6f2b37"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("invitations", sa.Column("template_id", sa.UUID(), nullable=True))
+    op.create_foreign_key(
+        "fk_invitations_template_id",
+        "invitations",
+        "invitation_templates",
+        ["template_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index("ix_invitations_template_id", "invitations", ["template_id"], unique=False)
+
+    # Best-effort backfill: link rows whose copied text matches exactly one template.
+    op.execute(
+        """
+        UPDATE invitations i
+        SET template_id = m.template_id
+        FROM (
+          SELECT i2.id AS invitation_id, MIN(t.id::text)::uuid AS template_id
+          FROM invitations i2
+          JOIN invitation_templates t
+            ON t.title = i2.title AND t.company_name = i2.company_name AND t.content = i2.content
+          GROUP BY i2.id
+          HAVING COUNT(*) = 1
+        ) m
+        WHERE i.id = m.invitation_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_invitations_template_id", table_name="invitations")
+    op.drop_constraint("fk_invitations_template_id", "invitations", type_="foreignkey")
+    op.drop_column("invitations", "template_id")
@@ -0,0 +1,77 @@
+"""add invitations.import_key for idempotent re-imports
+
+Revision ID: b8f2c4e7a931
+Revises: a3e9d6c1f470
+Create Date: 2026-10-18
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b8f2c4e7a931"
+down_revision = "a3e9d6c1f470"
+branch_labels = None
+depends_on = None
+
+
+# What str.split() treats as whitespace; \s in Postgres misses the non-ASCII ones (e.g. NBSP).
+_WHITESPACE = r"[\u0009-\u000d\u001c-\u0020\u0085\u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]"
+
+
+def _normalized(column: str) -> str:
+    # Same as app.core.invitation_import.import_key: NFC, collapsed whitespace, lower case.
+    collapsed = f"regexp_replace(normalize(coalesce({column}, ''), NFC), '{_WHITESPACE}+', ' ', 'g')"
+    return f"lower(btrim({collapsed}))"
+
+
+def _import_key(template_id: str, salutation: str, name: str, title: str) -> str:
+    # The importer keys a blank salutation as its default, "Ông".
+    return (
+        f"encode(sha256(convert_to(concat_ws(chr(31), {template_id}::text, "
+        f"coalesce(nullif({_normalized(salutation)}, ''), 'ông'), {_normalized(name)}, {_normalized(title)}), "
+        "'UTF8')), 'hex')"
+    )
+
+
+def upgrade() -> None:
+    op.add_column("invitations", sa.Column("import_key", sa.String(length=64), nullable=True))
+    op.add_column("import_jobs", sa.Column("updated", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("import_jobs", sa.Column("unchanged", sa.Integer(), nullable=False, server_default="0"))
+
+    # Key the guests imported so far, so the next upload of the same sheet
+    # matches them. Where earlier uploads already duplicated a guest, only the
+    # oldest copy gets the key.
+    key = _import_key("template_id", "recipient_salutation", "recipient_name", "recipient_title")
+    op.execute(
+        f"""
+        UPDATE invitations AS i SET import_key = k.key
+        FROM (
+          SELECT id, key, row_number() OVER (PARTITION BY key ORDER BY created_at, id) AS n
+          FROM (SELECT id, created_at, {key} AS key FROM invitations WHERE template_id IS NOT NULL) AS keyed
+        ) AS k
+        WHERE i.id = k.id AND k.n = 1
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_invitations_import_key",
+            "invitations",
+            ["import_key"],
+            unique=True,
+            postgresql_where=sa.text("import_key IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("uq_invitations_import_key", table_name="invitations", postgresql_concurrently=True, if_exists=True)
+    op.drop_column("import_jobs", "unchanged")
+    op.drop_column("import_jobs", "updated")
+    op.drop_column("invitations", "import_key")
@@ -0,0 +1,111 @@
+"""template versions: invitations inherit from a version instead of copies
+
+Revision ID: c4d7e1a9f236
+Revises: b8f2c4e7a931
+Create Date: 2026-10-18
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "c4d7e1a9f236"
+down_revision = "b8f2c4e7a931"
+branch_labels = None
+depends_on = None
+
+FIELDS = ("title", "company_name", "content", "event_time", "event_location", "google_map_url", "schedule")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "invitation_template_versions",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "template_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("invitation_templates.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("company_name", sa.String(length=255), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("event_time", sa.DateTime(), nullable=True),
+        sa.Column("event_location", sa.String(length=255), nullable=True),
+        sa.Column("google_map_url", sa.String(length=512), nullable=True),
+        sa.Column("schedule", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        "ix_invitation_template_versions_template_id", "invitation_template_versions", ["template_id"]
+    )
+    op.add_column("invitation_templates", sa.Column("current_version_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        "fk_invitation_templates_current_version",
+        "invitation_templates",
+        "invitation_template_versions",
+        ["current_version_id"],
+        ["id"],
+    )
+    op.add_column("invitations", sa.Column("template_version_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        "invitations_template_version_id_fkey",
+        "invitations",
+        "invitation_template_versions",
+        ["template_version_id"],
+        ["id"],
+    )
+
+    # One version per template with its current values; every linked
+    # invitation starts on it. Values pinned on invitations by earlier edits
+    # stay where they are, as overrides.
+    columns = ", ".join(FIELDS)
+    op.execute(
+        f"""
+        WITH v AS (
+            INSERT INTO invitation_template_versions (id, template_id, {columns})
+            SELECT gen_random_uuid(), id, {columns} FROM invitation_templates
+            RETURNING id, template_id
+        )
+        UPDATE invitation_templates AS t SET current_version_id = v.id FROM v WHERE v.template_id = t.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE invitations AS i SET template_version_id = t.current_version_id
+        FROM invitation_templates AS t
+        WHERE i.template_id = t.id
+        """
+    )
+
+
+def downgrade() -> None:
+    # Invitations not on their template's current version (or whose template
+    # is gone) get their own copy of what they inherit, as before versions.
+    op.execute(
+        """
+        UPDATE invitations AS i SET
+          title = COALESCE(i.title, v.title),
+          company_name = COALESCE(i.company_name, v.company_name),
+          content = COALESCE(i.content, v.content),
+          event_time = COALESCE(i.event_time, v.event_time),
+          event_location = COALESCE(i.event_location, v.event_location),
+          google_map_url = COALESCE(i.google_map_url, v.google_map_url, ''),
+          schedule = COALESCE(i.schedule, NULLIF(v.schedule::jsonb, 'null'::jsonb)::json, '[]'::json)
+        FROM invitation_template_versions AS v
+        WHERE v.id = i.template_version_id
+          AND v.id IS DISTINCT FROM (
+            SELECT t.current_version_id FROM invitation_templates AS t WHERE t.id = i.template_id
+          )
+        """
+    )
+    op.drop_constraint("invitations_template_version_id_fkey", "invitations", type_="foreignkey")
+    op.drop_column("invitations", "template_version_id")
+    op.drop_constraint("fk_invitation_templates_current_version", "invitation_templates", type_="foreignkey")
+    op.drop_column("invitation_templates", "current_version_id")
+    op.drop_index("ix_invitation_template_versions_template_id", table_name="invitation_template_versions")
+    op.drop_table("invitation_template_versions")
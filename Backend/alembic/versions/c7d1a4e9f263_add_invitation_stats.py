@@ -0,0 +1,52 @@
+"""add invitation_stats
+
+Revision ID: c7d1a4e9f263
+Revises: b2c9e7d41f05
+Create Date: 2026-10-18
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c7d1a4e9f263"
+down_revision = "b2c9e7d41f05"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "invitation_stats",
+        sa.Column("template_id", sa.UUID(), nullable=False),
+        sa.Column("invited", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("pending", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attending", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("declined", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("headcount", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("template_id"),
+    )
+
+    # Invitations without a template are counted under the nil UUID.
+    op.execute(
+        """
+        INSERT INTO invitation_stats (template_id, invited, pending, attending, declined, headcount)
+        SELECT
+          COALESCE(template_id, '00000000-0000-0000-0000-000000000000'::uuid),
+          COUNT(*),
+          COUNT(*) FILTER (WHERE rsvp_status = 'PENDING'),
+          COUNT(*) FILTER (WHERE rsvp_status = 'ATTENDING'),
+          COUNT(*) FILTER (WHERE rsvp_status = 'DECLINED'),
+          COALESCE(SUM(attendee_count) FILTER (WHERE rsvp_status = 'ATTENDING'), 0)
+        FROM invitations
+        GROUP BY 1
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("invitation_stats")
@@ -0,0 +1,26 @@
+"""add users.token_version
+
+Revision ID: d8b3f5a2c914
+Revises: c7d1a4e9f263
+Create Date: 2026-10-18
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d8b3f5a2c914"
+down_revision = "c7d1a4e9f263"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
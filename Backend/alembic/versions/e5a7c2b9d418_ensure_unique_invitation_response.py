@@ -0,0 +1,49 @@
+"""ensure one response row per invitation
+
+Revision ID: e5a7c2b9d418
+Revises: d8b3f5a2c914
+Create Date: 2026-10-18
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e5a7c2b9d418"
+down_revision = "d8b3f5a2c914"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 3f1c7a9b1c2d already created this constraint; databases that were
+    # patched by hand may lack it, so dedupe and create it only if missing.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+          IF NOT EXISTS (
+            SELECT 1 FROM pg_constraint WHERE conname = 'uq_invitation_responses_invitation_id'
+          ) THEN
+            DELETE FROM invitation_responses r
+            USING (
+              SELECT id,
+                     ROW_NUMBER() OVER (PARTITION BY invitation_id ORDER BY created_at DESC, id DESC) AS rn
+              FROM invitation_responses
+            ) s
+            WHERE r.id = s.id AND s.rn > 1;
+
+            ALTER TABLE invitation_responses
+              ADD CONSTRAINT uq_invitation_responses_invitation_id UNIQUE (invitation_id);
+          END IF;
+        END
+        $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    # The constraint belongs to 3f1c7a9b1c2d; nothing to undo here.
+    pass
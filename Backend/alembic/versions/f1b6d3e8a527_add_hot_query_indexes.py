@@ -0,0 +1,45 @@
+"""add indexes for the hot invitation queries
+
+Revision ID: f1b6d3e8a527
+Revises: e5a7c2b9d418
+Create Date: 2026-10-18
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f1b6d3e8a527"
+down_revision = "e5a7c2b9d418"
+branch_labels = None
+depends_on = None
+
+# invitation_responses.invitation_id and invitations.slug are already covered
+# by their unique constraints' indexes.
+INDEXES = [
+    # Admin list default order and keyset pagination; the export order too.
+    ("ix_invitations_created_at_id", ["created_at", "id"], {}),
+    # Admin list sorted by name.
+    ("ix_invitations_recipient_name_id", ["recipient_name", "id"], {}),
+    # max(updated_at) in the export ETag.
+    ("ix_invitations_updated_at", ["updated_at"], {}),
+    # `slug LIKE 'base-%'` in the slug allocator; the unique index only
+    # serves prefix matches under the C collation.
+    ("ix_invitations_slug_pattern", ["slug"], {"postgresql_ops": {"slug": "varchar_pattern_ops"}}),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction, and it keeps the table
+    # writable while the index builds.
+    with op.get_context().autocommit_block():
+        for name, columns, kw in INDEXES:
+            op.create_index(name, "invitations", columns, postgresql_concurrently=True, if_not_exists=True, **kw)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name="invitations", postgresql_concurrently=True, if_exists=True)
@@ -1,17 +1,40 @@
+import hashlib
+import os
+import time
+from typing import NamedTuple
+from uuid import UUID
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal
+from app.core.cache import TTLCache
+from app.core.database import AsyncSessionLocal, SessionLocal
 from app.models.user import User
 from app.core.security import SECRET_KEY, ALGORITHM
 from dotenv import load_dotenv
-import os
 
 load_dotenv()
 
+# How long a verified token is trusted without re-reading the user row. This
+# bounds how late a disabled user or a bumped token_version is noticed by
+# other worker processes; the process that revokes drops its cache at once.
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 10))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 1024))
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+
+class Principal(NamedTuple):
+    id: UUID
+    username: str
+    token_version: int
+    expires_at: float
+
+
+_principals = TTLCache(AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -19,20 +42,66 @@ def get_db():
     finally:
         db.close()
 
-def get_current_admin(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _load_principal(username: str, version: int, expires_at: float) -> Principal | None:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == username).first()
+        if user is None or not user.is_admin or user.token_version != version:
+            return None
+        return Principal(user.id, user.username, user.token_version, expires_at)
+    finally:
+        db.close()
+
+
+def get_current_admin(token: str = Depends(oauth2_scheme)) -> Principal:
+    """Verified admin for the bearer token.
+
+    Accepted tokens are cached by their SHA-256 for AUTH_CACHE_TTL seconds, so
+    most admin requests skip both the JWT verification and the users query.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    key = hashlib.sha256(token.encode()).digest()
+    principal = _principals.get(key)
+    if principal is not None:
+        if principal.expires_at > time.time():
+            return principal
+        _principals.pop(key)
+        raise credentials_exception
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
-        if username is None:
+        # jose checks "exp" only when present; a token without one would be
+        # cached, and trusted, forever.
+        expires_at = payload.get("exp")
+        if username is None or expires_at is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.username == username).first()
-    if user is None or not user.is_admin:
+    # Tokens issued before versioning carry no "ver" and match version 0.
+    principal = _load_principal(username, int(payload.get("ver", 0)), float(expires_at))
+    if principal is None:
         raise credentials_exception
-    return user
+    _principals.set(key, principal)
+    return principal
+
+
+def revoke_tokens(db: Session, user: User) -> None:
+    """Invalidate every token issued to `user` so far and commit.
+
+    The cache is dropped only after the commit: a request verified in
+    between would otherwise re-cache the old version for AUTH_CACHE_TTL.
+    """
+    user.token_version = User.token_version + 1
+    db.commit()
+    _principals.clear()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.models.invitation import Invitation
+from app.models.invitation_response import InvitationResponse
+
+# Committed writes to these tables notify the subscribers. Statements the ORM
+# cannot see (text() SQL) must call `mark(session)` themselves.
+_TRACKED = (Invitation, InvitationResponse)
+_FLAG = "invitations_changed"
+
+_listeners: list[Callable[[], None]] = []
+
+
+def subscribe(fn: Callable[[], None]) -> None:
+    _listeners.append(fn)
+
+
+def mark(session: Session) -> None:
+    session.info[_FLAG] = True
+
+
+def _notify() -> None:
+    for fn in _listeners:
+        fn()
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _TRACKED):
+            mark(session)
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _do_orm_execute(state: ORMExecuteState) -> None:
+    if (state.is_insert or state.is_update or state.is_delete) and state.bind_mapper is not None:
+        if issubclass(state.bind_mapper.class_, _TRACKED):
+            mark(state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    if session.info.pop(_FLAG, False):
+        _notify()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_FLAG, None)
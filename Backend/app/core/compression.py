@@ -0,0 +1,166 @@
+"""Negotiated gzip / brotli response compression.
+
+`CompressionMiddleware` compresses a response when the client accepts it and
+the body is at least COMPRESSION_MIN_SIZE bytes. Streamed responses are
+compressed chunk by chunk with a flush after each, so every chunk still
+reaches the client as soon as the app yields it. Bodies that are compressed
+already (xlsx is a zip archive, images, ...) and responses that carry their
+own Content-Encoding pass through untouched. `brotli` is in
+requirements.txt; an install without it offers gzip only.
+"""
+from __future__ import annotations
+
+import os
+import zlib
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.invitation_export import XLSX_MEDIA_TYPE
+
+try:
+    import brotli
+except ImportError:  # trimmed install; gzip only
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "1").lower() not in ("0", "false", "no")
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+# 4 is the usual on-the-fly setting: smaller than gzip -6 at similar CPU.
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+# Chunks at least this big are compressed in the threadpool, off the event loop.
+COMPRESSION_THREAD_MIN_SIZE = 128 * 1024
+
+SKIP_MEDIA_TYPES = {XLSX_MEDIA_TYPE, "application/zip", "application/gzip", "text/event-stream"}
+SKIP_MEDIA_PREFIXES = ("image/", "audio/", "video/", "font/")
+
+
+class _Gzip:
+    def __init__(self) -> None:
+        self._z = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _Brotli:
+    def __init__(self) -> None:
+        self._c = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._c.process(data)
+        return out + (self._c.finish() if final else self._c.flush())
+
+
+ENCODERS = {"gzip": _Gzip, **({"br": _Brotli} if brotli is not None else {})}
+# Server preference when the client accepts several equally.
+_PREFERENCE = ("br", "gzip")
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """The encoding to use for an Accept-Encoding header, or None for identity."""
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, *params = (p.strip() for p in part.split(";"))
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            qualities[name.lower()] = q
+
+    best, best_q = None, 0.0
+    for name in _PREFERENCE:
+        if name not in ENCODERS:
+            continue
+        q = qualities.get(name, qualities.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def _compressible(headers: Headers, status: int) -> bool:
+    if "content-encoding" in headers or status in (204, 206, 304):
+        return False
+    media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+    return media_type not in SKIP_MEDIA_TYPES and not media_type.startswith(SKIP_MEDIA_PREFIXES)
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    # The compressed bytes differ from the identity ones; a strong validator
+    # would claim they are the same representation.
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+async def _compress(encoder, data: bytes, final: bool) -> bytes:
+    if len(data) >= COMPRESSION_THREAD_MIN_SIZE:
+        return await run_in_threadpool(encoder.compress, data, final)
+    return encoder.compress(data, final)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware; holds back only the response start until the first body chunk."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start = None
+        encoder = None
+
+        async def send_wrapper(message):
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if message["status"] == 304 and encoding is not None:
+                    # Same validator as the compressed 200 this revalidates.
+                    _weaken_etag(headers)
+                if not _compressible(headers, message["status"]):
+                    await send(message)
+                    return
+                # Caches must not hand a compressed body to a client that did not ask for it.
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    await send(message)
+                    return
+                start = message
+                return
+
+            if start is None:
+                if encoder is not None and message["type"] == "http.response.body":
+                    more_body = message.get("more_body", False)
+                    message = {**message, "body": await _compress(encoder, message.get("body", b""), not more_body)}
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            pending, start = start, None
+            if message["type"] != "http.response.body" or (not more_body and len(body) < COMPRESSION_MIN_SIZE):
+                await send(pending)
+                await send(message)
+                return
+
+            encoder = ENCODERS[encoding]()
+            headers = MutableHeaders(raw=pending["headers"])
+            headers["Content-Encoding"] = encoding
+            del headers["Content-Length"]
+            _weaken_etag(headers)
+            body = await _compress(encoder, body, not more_body)
+            if not more_body:
+                headers["Content-Length"] = str(len(body))
+            await send(pending)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,13 +1,77 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 from dotenv import load_dotenv
 
+from app.core.db_pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+
+def _flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() not in ("0", "false", "no")
+
+
+# Pool sizes apply per engine and per process: the sync and async engines each
+# get their own pool, and every uvicorn worker has its own pair.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+# Seconds after which a pooled connection is replaced; -1 keeps connections forever.
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", -1))
+# Round trip on every checkout to weed out dead connections. With DB_POOL_RECYCLE
+# below the server/proxy idle timeout it can usually be turned off.
+DB_POOL_PRE_PING = _flag("DB_POOL_PRE_PING", "1")
+# Behind PgBouncer in transaction mode: no client-side pool (PgBouncer pools),
+# and no server-side prepared statements, which do not survive a backend switch.
+DB_PGBOUNCER = _flag("DB_PGBOUNCER", "0")
+
+# Async drivers for the sync URL's backend; ASYNC_DATABASE_URL overrides the mapping.
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r}")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_url(DATABASE_URL)
+
+
+def _pool_args(pool_class) -> dict:
+    if DB_PGBOUNCER:
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": pool_class,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def _async_connect_args() -> dict:
+    if DB_PGBOUNCER and make_url(ASYNC_DATABASE_URL).get_driver_name() == "asyncpg":
+        return {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    return {}
+
+
+engine = create_engine(DATABASE_URL, **_pool_args(InstrumentedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Used by the guest endpoints, which run on the event loop instead of the threadpool.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args=_async_connect_args(),
+    **_pool_args(InstrumentedAsyncQueuePool),
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Upper bounds, in seconds, of the checkout wait histogram buckets.
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Checkouts slower than this count as having waited for a connection.
+WAIT_THRESHOLD = 0.001
+
+# QueuePool._do_get retries by calling itself; only the outermost call is timed.
+_in_checkout: ContextVar[bool] = ContextVar("in_checkout", default=False)
+
+
+class PoolMetrics:
+    """Checkout counters and a wait-time histogram for one pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self._buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += seconds
+            if seconds > WAIT_THRESHOLD:
+                self.waits += 1
+            self._buckets[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+
+    def timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative, total = [], 0
+            for bound, count in zip((*WAIT_BUCKETS, float("inf")), self._buckets):
+                total += count
+                cumulative.append({"le": bound, "count": total})
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_seconds_sum": round(self.wait_seconds, 6),
+                "wait_histogram": cumulative,
+            }
+
+
+class _InstrumentedMixin:
+    # One metrics object per class, so it survives Pool.recreate().
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        if _in_checkout.get():
+            return super()._do_get()
+        token = _in_checkout.set(True)
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeout()
+            raise
+        finally:
+            _in_checkout.reset(token)
+        self.metrics.observe(time.perf_counter() - start)
+        return conn
+
+
+class InstrumentedQueuePool(_InstrumentedMixin, QueuePool):
+    metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedMixin, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
+
+
+def pool_status(pool: Pool) -> dict:
+    """Current occupancy plus the checkout metrics of an instrumented pool."""
+    status: dict = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, _InstrumentedMixin):
+        status.update(pool.metrics.snapshot())
+    return status
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.invitation_import import ImportProgress, import_file
+from app.models.import_job import ImportJob, ImportJobState
+from app.models.invitation import InvitationStatus
+from app.models.template import InvitationTemplate
+
+logger = logging.getLogger(__name__)
+
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", 2))
+# A RUNNING job whose progress has not moved for this long is treated as orphaned
+# (its worker died) and may be claimed again.
+IMPORT_JOB_STALE_SECONDS = int(os.getenv("IMPORT_JOB_STALE_SECONDS", 300))
+# Only the first errors are kept on the job row; error_count has the full total.
+IMPORT_JOB_MAX_ERRORS = int(os.getenv("IMPORT_JOB_MAX_ERRORS", 1000))
+# How often to look for queued jobs and RUNNING jobs gone stale. Without the
+# repeat, a job orphaned by a worker that restarted within
+# IMPORT_JOB_STALE_SECONDS would not be stale yet at startup and never resume.
+IMPORT_JOB_SWEEP_SECONDS = float(os.getenv("IMPORT_JOB_SWEEP_SECONDS", 60))
+
+_executor = ThreadPoolExecutor(max_workers=IMPORT_JOB_WORKERS, thread_name_prefix="import-job")
+# Jobs queued or running in this process, so repeated sweeps do not pile them up.
+_lock = threading.Lock()
+_active: set[UUID] = set()
+_stop = threading.Event()
+_sweeper: threading.Thread | None = None
+
+
+def submit(job_id: UUID) -> None:
+    with _lock:
+        if job_id in _active:
+            return
+        _active.add(job_id)
+    _executor.submit(_run, job_id)
+
+
+def _run(job_id: UUID) -> None:
+    try:
+        run_job(job_id)
+    finally:
+        with _lock:
+            _active.discard(job_id)
+
+
+def resume_pending() -> None:
+    """Queue jobs left behind by a previous process, then keep sweeping every IMPORT_JOB_SWEEP_SECONDS.
+
+    Claiming keeps this safe with several workers.
+    """
+    global _sweeper
+    _stop.clear()
+    _sweeper = threading.Thread(target=_sweep_loop, name="import-job-sweep", daemon=True)
+    _sweeper.start()
+
+
+def _sweep_loop() -> None:
+    while True:
+        try:
+            _resume_pending()
+        except Exception:
+            logger.exception("Import job sweep failed")
+        if _stop.wait(IMPORT_JOB_SWEEP_SECONDS):
+            return
+
+
+def _claimable():
+    # updated_at moves with every committed chunk, so it doubles as a heartbeat.
+    stale_before = ImportJob.updated_at < func.now() - timedelta(seconds=IMPORT_JOB_STALE_SECONDS)
+    return or_(
+        ImportJob.state == ImportJobState.QUEUED,
+        (ImportJob.state == ImportJobState.RUNNING) & stale_before,
+    )
+
+
+def _resume_pending() -> None:
+    db = SessionLocal()
+    try:
+        ids = [job_id for (job_id,) in db.query(ImportJob.id).filter(_claimable()).order_by(ImportJob.created_at)]
+    finally:
+        db.close()
+    for job_id in ids:
+        submit(job_id)
+
+
+def shutdown() -> None:
+    # Unfinished jobs stay RUNNING in the DB and are resumed from their last chunk.
+    _stop.set()
+    _executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _claim(db: Session, job_id: UUID) -> bool:
+    result = db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, _claimable())
+        .values(state=ImportJobState.RUNNING)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def _finish(db: Session, job: ImportJob, state: ImportJobState, detail: str | None = None) -> None:
+    job.state = state
+    job.detail = detail
+    db.commit()
+    if os.path.exists(job.file_path):
+        os.unlink(job.file_path)
+
+
+def run_job(job_id: UUID) -> None:
+    db = SessionLocal()
+    try:
+        if not _claim(db, job_id):
+            return
+        job = db.query(ImportJob).filter(ImportJob.id == job_id).one()
+        tpl = db.query(InvitationTemplate).filter(InvitationTemplate.id == job.template_id).first()
+        if not tpl:
+            _finish(db, job, ImportJobState.FAILED, "Template not found")
+            return
+
+        def on_commit(progress: ImportProgress) -> None:
+            job.last_row = progress.last_row
+            job.rows_processed += progress.rows
+            job.created += len(progress.created)
+            job.updated += len(progress.updated)
+            job.unchanged += progress.unchanged
+            job.skipped += progress.skipped
+            if progress.errors:
+                room = IMPORT_JOB_MAX_ERRORS - len(job.errors)
+                if room > 0:
+                    job.errors = [*job.errors, *(e.model_dump() for e in progress.errors[:room])]
+                job.error_count += len(progress.errors)
+
+        try:
+            import_file(
+                db,
+                job.file_path,
+                tpl,
+                InvitationStatus(job.invitation_status),
+                start_row=job.last_row,
+                on_commit=on_commit,
+            )
+        except HTTPException as exc:
+            db.rollback()
+            _finish(db, job, ImportJobState.FAILED, str(exc.detail))
+            return
+        _finish(db, job, ImportJobState.COMPLETED)
+    except Exception:
+        logger.exception("Import job %s failed", job_id)
+        db.rollback()
+        job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+        if job:
+            _finish(db, job, ImportJobState.FAILED, "Internal error")
+    finally:
+        db.close()
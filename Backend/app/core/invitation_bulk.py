@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+from typing import Iterator, Sequence
+
+from sqlalchemy import Row, column, delete, select, update, values
+from sqlalchemy.orm import Session
+
+from app.core import invitation_cache, invitation_stats, template_content
+from app.core.slugs import SlugAllocator, slug_base
+from app.models.invitation import Invitation, InvitationStatus
+from app.models.invitation_response import InvitationResponse
+from app.schemas.invitation_bulk import InvitationBulkItem, InvitationBulkResult, InvitationBulkSelection
+
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", 1000))
+
+
+def _batches(db: Session, selection: InvitationBulkSelection, columns: Sequence, *where) -> Iterator[list[Row]]:
+    """Lock and yield the selected rows, at most BULK_BATCH_SIZE per batch.
+
+    Rows are locked in id order, so two bulk requests over overlapping sets
+    wait for each other instead of deadlocking. The caller commits each batch
+    before asking for the next one; nothing holds a transaction for the whole set.
+    """
+    filters = list(where)
+    if selection.template_id is not None:
+        filters.append(Invitation.template_id == selection.template_id)
+    if selection.rsvp_status is not None:
+        filters.append(Invitation.rsvp_status == selection.rsvp_status)
+    stmt = select(Invitation.id, *columns).where(*filters).order_by(Invitation.id).with_for_update()
+
+    if selection.ids is not None:
+        ids = sorted(set(selection.ids))
+        for start in range(0, len(ids), BULK_BATCH_SIZE):
+            rows = db.execute(stmt.where(Invitation.id.in_(ids[start : start + BULK_BATCH_SIZE]))).all()
+            if rows:
+                yield rows
+        return
+
+    last_id = None
+    while True:
+        page = stmt if last_id is None else stmt.where(Invitation.id > last_id)
+        rows = db.execute(page.limit(BULK_BATCH_SIZE)).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def _publish_batch(db: Session, allocator: SlugAllocator, rows: list[Row]) -> list[InvitationBulkItem]:
+    # Drafts that were published before keep their slug, so old links come back.
+    assigned = {row.id: row.slug for row in rows}
+    bases = {row.id: slug_base(row.title, row.recipient_name) for row in rows if not row.slug}
+
+    def assign() -> None:
+        allocator.prefetch(bases.values())
+        for invitation_id, base in bases.items():
+            assigned[invitation_id] = allocator.allocate(base)
+
+    def write() -> None:
+        new = values(column("id", Invitation.id.type), column("slug", Invitation.slug.type), name="new").data(
+            list(assigned.items())
+        )
+        db.execute(
+            update(Invitation)
+            .where(Invitation.id == new.c.id)
+            .values(slug=new.c.slug, status=InvitationStatus.published)
+            .execution_options(synchronize_session=False)
+        )
+
+    allocator.write(assign, write)
+    return [InvitationBulkItem(id=invitation_id, slug=slug) for invitation_id, slug in assigned.items()]
+
+
+def publish(db: Session, selection: InvitationBulkSelection) -> InvitationBulkResult:
+    """Publish the selected drafts, allocating slugs one prefix query per batch."""
+    allocator = SlugAllocator(db)
+    items: list[InvitationBulkItem] = []
+    columns = (Invitation.slug, template_content.effective_column("title"), Invitation.recipient_name)
+    for rows in _batches(db, selection, columns, Invitation.status == InvitationStatus.draft):
+        batch = _publish_batch(db, allocator, rows)
+        db.commit()
+        invitation_cache.invalidate(*(item.slug for item in batch))
+        items.extend(batch)
+    return InvitationBulkResult(affected=len(items), items=items)
+
+
+def unpublish(db: Session, selection: InvitationBulkSelection) -> InvitationBulkResult:
+    """Move the selected published invitations back to draft; their slugs are kept."""
+    items: list[InvitationBulkItem] = []
+    for rows in _batches(db, selection, (Invitation.slug,), Invitation.status == InvitationStatus.published):
+        db.execute(
+            update(Invitation)
+            .where(Invitation.id.in_([row.id for row in rows]))
+            .values(status=InvitationStatus.draft)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        invitation_cache.invalidate(*(row.slug for row in rows))
+        items.extend(InvitationBulkItem(id=row.id, slug=row.slug) for row in rows)
+    return InvitationBulkResult(affected=len(items), items=items)
+
+
+def delete_selected(db: Session, selection: InvitationBulkSelection) -> InvitationBulkResult:
+    """Delete the selected invitations and their responses, keeping the summary totals in step."""
+    items: list[InvitationBulkItem] = []
+    columns = (Invitation.slug, Invitation.template_id, Invitation.rsvp_status, Invitation.attendee_count)
+    for rows in _batches(db, selection, columns):
+        ids = [row.id for row in rows]
+        db.execute(delete(InvitationResponse).where(InvitationResponse.invitation_id.in_(ids)))
+        db.execute(delete(Invitation).where(Invitation.id.in_(ids)).execution_options(synchronize_session=False))
+        invitation_stats.record_deleted_many(db, ((r.template_id, r.rsvp_status, r.attendee_count) for r in rows))
+        db.commit()
+        invitation_cache.invalidate(*(row.slug for row in rows))
+        items.extend(InvitationBulkItem(id=row.id, slug=row.slug) for row in rows)
+    return InvitationBulkResult(affected=len(items), items=items)
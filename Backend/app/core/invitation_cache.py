@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, NamedTuple
+from uuid import UUID
+
+from app.core.cache import TTLCache
+
+INVITATION_CACHE_SIZE = int(os.getenv("INVITATION_CACHE_SIZE", 10000))
+# Bounds staleness for writes made by other worker processes; writes made in
+# this process invalidate their slug immediately.
+INVITATION_CACHE_TTL = float(os.getenv("INVITATION_CACHE_TTL", 30))
+# `no-cache` lets browsers and a reverse proxy keep the body but revalidate with
+# If-None-Match on every view, which this process answers from memory.
+INVITATION_CACHE_CONTROL = os.getenv("INVITATION_CACHE_CONTROL", "public, no-cache")
+
+
+class CachedInvitation(NamedTuple):
+    id: UUID
+    body: bytes
+    etag: str
+
+
+def make_entry(invitation_id: UUID, body: bytes) -> CachedInvitation:
+    return CachedInvitation(invitation_id, body, f'"{hashlib.sha1(body).hexdigest()}"')
+
+
+_cache = TTLCache(INVITATION_CACHE_SIZE, ttl=INVITATION_CACHE_TTL)
+_lock = threading.Lock()
+_inflight: dict[str, Future] = {}
+# Same for coroutine loads, per event loop; only touched from the loop's own thread.
+_inflight_tasks: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Task] = {}
+# Bumped by every invalidation; a load that overlapped one is returned but not stored.
+_epoch = 0
+
+
+def get(slug: str, load: Callable[[], CachedInvitation | None]) -> CachedInvitation | None:
+    """Return the cached invitation, running `load` at most once per slug across threads."""
+    hit = _cache.get(slug)
+    if hit is not None:
+        return hit
+
+    with _lock:
+        future = _inflight.get(slug)
+        leader = future is None
+        if leader:
+            future = _inflight[slug] = Future()
+            epoch = _epoch
+    if not leader:
+        return future.result()
+
+    try:
+        entry = load()
+    except BaseException as exc:
+        with _lock:
+            _inflight.pop(slug, None)
+        future.set_exception(exc)
+        raise
+
+    with _lock:
+        _inflight.pop(slug, None)
+        if entry is not None and epoch == _epoch:
+            _cache.set(slug, entry)
+    future.set_result(entry)
+    return entry
+
+
+async def aget(slug: str, load: Callable[[], Awaitable[CachedInvitation | None]]) -> CachedInvitation | None:
+    """Async `get`: concurrent misses on one event loop await a single `load`.
+
+    The load runs as its own task, so a caller that is cancelled (client gone)
+    does not abort it for the others; it should therefore not use a
+    request-scoped session.
+    """
+    hit = _cache.get(slug)
+    if hit is not None:
+        return hit
+
+    key = (asyncio.get_running_loop(), slug)
+    task = _inflight_tasks.get(key)
+    if task is None:
+        task = _inflight_tasks[key] = asyncio.ensure_future(_load_and_store(key, load))
+    return await asyncio.shield(task)
+
+
+async def _load_and_store(key, load: Callable[[], Awaitable[CachedInvitation | None]]) -> CachedInvitation | None:
+    with _lock:
+        epoch = _epoch
+    try:
+        entry = await load()
+    finally:
+        _inflight_tasks.pop(key, None)
+
+    with _lock:
+        if entry is not None and epoch == _epoch:
+            _cache.set(key[1], entry)
+    return entry
+
+
+def invalidate(*slugs: str | None) -> None:
+    global _epoch
+    with _lock:
+        _epoch += 1
+        for slug in slugs:
+            if slug:
+                _cache.pop(slug)
+
+
+def clear() -> None:
+    global _epoch
+    with _lock:
+        _epoch += 1
+        _cache.clear()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import atexit
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Hashable, Iterator
+
+import openpyxl
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core import changes
+from app.core.cache import TTLCache
+from app.models.invitation import Invitation
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+# Generated files kept on disk, one per (data revision, format, base URL).
+EXPORT_CACHE_SIZE = int(os.getenv("EXPORT_CACHE_SIZE", 8))
+FILE_CHUNK_SIZE = 64 * 1024
+
+# Per-process spool for generated files; cache entries do not outlive the process.
+_SPOOL_DIR = tempfile.mkdtemp(prefix="invitation_export_")
+atexit.register(shutil.rmtree, _SPOOL_DIR, True)
+# Rows buffered per yielded chunk for the text formats.
+STREAM_FLUSH_ROWS = 500
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+MEDIA_TYPES = {
+    "xlsx": XLSX_MEDIA_TYPE,
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_HEADERS = [
+    "recipient_salutation",
+    "recipient_name",
+    "recipient_title",
+    "status",
+    "slug",
+    "invite_url",
+    "rsvp_status",
+    "attendee_count",
+    "created_at",
+]
+
+
+def iter_export_rows(db: Session, base_url: str) -> Iterator[list[object]]:
+    """Yield one spreadsheet row per invitation, newest first.
+
+    Only the exported columns are selected and rows come from a server-side
+    cursor in EXPORT_BATCH_SIZE batches, so memory does not grow with the table.
+    """
+    stmt = (
+        select(
+            Invitation.recipient_salutation,
+            Invitation.recipient_name,
+            Invitation.recipient_title,
+            Invitation.status,
+            Invitation.slug,
+            Invitation.rsvp_status,
+            Invitation.attendee_count,
+            Invitation.created_at,
+        )
+        .order_by(Invitation.created_at.desc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for salutation, name, title, status, slug, rsvp_status, attendee_count, created_at in db.execute(stmt):
+        slug = slug or ""
+        invite_path = f"/invite/{slug}" if slug else ""
+        invite_url = f"{base_url}{invite_path}" if base_url and slug else invite_path
+
+        yield [
+            salutation or "",
+            name,
+            title,
+            status.value if hasattr(status, "value") else str(status),
+            slug,
+            invite_url,
+            rsvp_status.value if hasattr(rsvp_status, "value") else str(rsvp_status),
+            int(attendee_count or 0),
+            created_at.isoformat() if created_at else "",
+        ]
+
+
+def write_xlsx(rows: Iterator[list[object]]) -> str:
+    """Write rows to a temp .xlsx with openpyxl's write-only mode and return its path.
+
+    Write-only worksheets spill rows to disk as they are appended, so memory
+    stays flat however many invitations there are.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Invitations")
+    ws.append(EXPORT_HEADERS)
+    for row in rows:
+        ws.append(row)
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx", dir=_SPOOL_DIR)
+    os.close(fd)
+    try:
+        wb.save(path)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def iter_csv(rows: Iterator[list[object]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_HEADERS)
+    for i, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if i % STREAM_FLUSH_ROWS == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode("utf-8")
+
+
+def iter_ndjson(rows: Iterator[list[object]]) -> Iterator[bytes]:
+    lines: list[str] = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(EXPORT_HEADERS, row)), ensure_ascii=False))
+        if len(lines) >= STREAM_FLUSH_ROWS:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _remove_file(key: Hashable, path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+_cache = TTLCache(EXPORT_CACHE_SIZE, on_evict=_remove_file)
+changes.subscribe(_cache.clear)
+
+
+def export_etag(db: Session, format: str, base_url: str) -> str:
+    """Weak ETag for the export as it would be generated right now.
+
+    Built only from the data, so every worker computes the same tag: row
+    count catches deletes, max(updated_at) every other write, whichever
+    process made it.
+    """
+    count, last_update = db.query(func.count(Invitation.id), func.max(Invitation.updated_at)).one()
+    revision = f"{count}:{last_update.isoformat() if last_update else ''}"
+    digest = hashlib.sha1(f"{revision}|{format}|{base_url}".encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def open_cached(etag: str) -> BinaryIO | None:
+    # Opened under the cache lock: once open, eviction unlinking the file is harmless.
+    with _cache.lock:
+        path = _cache.get(etag)
+        return open(path, "rb") if path else None
+
+
+def cache_and_open(etag: str, path: str) -> BinaryIO:
+    with _cache.lock:
+        _cache.set(etag, path)
+        return open(path, "rb")
+
+
+def iter_file(fh: BinaryIO) -> Iterator[bytes]:
+    with fh:
+        while chunk := fh.read(FILE_CHUNK_SIZE):
+            yield chunk
+
+
+def tee_to_cache(chunks: Iterator[bytes], etag: str) -> Iterator[bytes]:
+    """Pass chunks through to the client while spooling them into the export cache."""
+    fd, path = tempfile.mkstemp(dir=_SPOOL_DIR)
+    completed = False
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in chunks:
+                out.write(chunk)
+                yield chunk
+        completed = True
+    finally:
+        if completed:
+            _cache.set(etag, path)
+        else:
+            os.unlink(path)
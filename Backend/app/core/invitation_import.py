@@ -0,0 +1,660 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import threading
+import unicodedata
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Callable, Iterator, NamedTuple
+
+import openpyxl
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import DateTime, case, cast, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core import invitation_cache, invitation_stats, template_content
+from app.core.slugs import SlugAllocator, slug_base
+from app.models.invitation import Invitation, InvitationStatus
+from app.models.template import InvitationTemplate
+from app.schemas.invitation_import import InvitationImportCreatedItem, InvitationImportErrorItem, InvitationImportResult
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 1000))
+IMPORT_SPOOL_DIR = os.getenv("IMPORT_SPOOL_DIR") or None
+IMPORT_EXTENSIONS = (".xlsx", ".csv", ".ndjson")
+SPOOL_COPY_BUFSIZE = 1024 * 1024
+# Processes that parse a large workbook by row range while the request or job
+# thread writes; 0 or 1 parses in-process. The default leaves one core for
+# the writer.
+IMPORT_PARSE_WORKERS = int(os.getenv("IMPORT_PARSE_WORKERS", max(0, min(4, (os.cpu_count() or 1) - 1))))
+# Data rows per parse task. A sheet with no more rows than this is parsed in-process.
+IMPORT_PARSE_RANGE_ROWS = int(os.getenv("IMPORT_PARSE_RANGE_ROWS", 10000))
+
+# Allow a few common header variants.
+HEADER_ALIASES = {
+    "recipient_salutation": {
+        "recipient_salutation",
+        "salutation",
+        "xung_ho",
+        "xungho",
+        "ong_ba",
+        "ông_bà",
+        "ong",
+        "ba",
+    },
+    "recipient_name": {
+        "recipient_name",
+        "name",
+        "ten",
+        "ho_ten",
+        "họ_tên",
+        "nguoi_nhan",
+        "người_nhận",
+    },
+    "recipient_title": {
+        "recipient_title",
+        "title",
+        "chuc_danh",
+        "chức_danh",
+        "chuc_vu",
+        "chức_vụ",
+    },
+}
+_CANONICAL_BY_ALIAS = {alias: canonical for canonical, keys in HEADER_ALIASES.items() for alias in keys}
+
+
+class ImportRow(NamedTuple):
+    row: int
+    salutation: str
+    name: str
+    title: str
+    error: str | None = None
+
+
+def _normalize_header(v: object) -> str:
+    if v is None:
+        return ""
+    s = str(v).strip().lower()
+    s = s.replace("\u00a0", " ")
+    s = " ".join(s.split())
+    s = s.replace("-", "_")
+    s = s.replace(" ", "_")
+    return s
+
+
+def _cell_text(v: object) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, datetime):
+        return v.isoformat()
+    return str(v).strip()
+
+
+def _safe_cell_text(row: tuple[object, ...], idx: int | None) -> str:
+    if idx is None:
+        return ""
+    if idx < 0:
+        return ""
+    if idx >= len(row):
+        return ""
+    return _cell_text(row[idx])
+
+
+def spool_upload(file: UploadFile) -> str:
+    """Copy the upload to a named temp file in fixed-size blocks and return its path."""
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    fd, path = tempfile.mkstemp(suffix=suffix, prefix="import_", dir=IMPORT_SPOOL_DIR)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            file.file.seek(0)
+            shutil.copyfileobj(file.file, out, SPOOL_COPY_BUFSIZE)
+            size = out.tell()
+    except BaseException:
+        os.unlink(path)
+        raise
+    if not size:
+        os.unlink(path)
+        raise HTTPException(status_code=400, detail="Empty file")
+    return path
+
+
+def _iter_csv_rows(path: str) -> Iterator[list[str]]:
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.reader(f)
+    except (UnicodeDecodeError, csv.Error):
+        raise HTTPException(status_code=400, detail="Invalid .csv file")
+
+
+def _iter_ndjson_rows(path: str) -> Iterator[ImportRow]:
+    """One JSON object per line; keys go through the same header aliasing as sheet columns."""
+    try:
+        with open(path, encoding="utf-8-sig") as f:
+            for line_num, line in enumerate(f, start=1):
+                if not line.strip():
+                    yield ImportRow(row=line_num, salutation="", name="", title="")
+                    continue
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    yield ImportRow(row=line_num, salutation="", name="", title="", error="Invalid JSON")
+                    continue
+                if not isinstance(obj, dict):
+                    yield ImportRow(row=line_num, salutation="", name="", title="", error="Expected a JSON object")
+                    continue
+
+                fields: dict[str, str] = {}
+                for key, value in obj.items():
+                    canonical = _CANONICAL_BY_ALIAS.get(_normalize_header(key))
+                    if canonical and canonical not in fields:
+                        fields[canonical] = _cell_text(value)
+                yield ImportRow(
+                    row=line_num,
+                    salutation=fields.get("recipient_salutation", ""),
+                    name=fields.get("recipient_name", ""),
+                    title=fields.get("recipient_title", ""),
+                )
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid .ndjson file")
+
+
+def _resolve_columns(header_row: tuple[object, ...]) -> dict[str, int]:
+    headers = [_normalize_header(h) for h in header_row]
+
+    index_map: dict[str, int] = {}
+    for i, h in enumerate(headers):
+        for canonical, keys in HEADER_ALIASES.items():
+            if h in keys and canonical not in index_map:
+                index_map[canonical] = i
+
+    if "recipient_name" not in index_map or "recipient_title" not in index_map:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing required columns: recipient_name and recipient_title",
+        )
+    return index_map
+
+
+def _checked(item: ImportRow) -> ImportRow:
+    """Flag rows missing a required field; blank rows pass as they are and the writer skips them."""
+    if item.error or not (item.name or item.title or item.salutation):
+        return item
+    if not item.name:
+        return item._replace(error="Missing recipient_name")
+    if not item.title:
+        return item._replace(error="Missing recipient_title")
+    return item
+
+
+def _open_workbook(path: str):
+    try:
+        return openpyxl.load_workbook(path, read_only=True, data_only=True)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid .xlsx file")
+
+
+def _sheet_rows(ws, index_map: dict[str, int], first: int = 2, last: int | None = None) -> Iterator[ImportRow]:
+    # Excel rows are 1-based; header is row 1, data starts at row 2.
+    for excel_row_num, row in enumerate(ws.iter_rows(min_row=first, max_row=last, values_only=True), start=first):
+        yield _checked(
+            ImportRow(
+                row=excel_row_num,
+                salutation=_safe_cell_text(row, index_map.get("recipient_salutation")),
+                name=_safe_cell_text(row, index_map.get("recipient_name")),
+                title=_safe_cell_text(row, index_map.get("recipient_title")),
+            )
+        )
+
+
+_SHEET_DATA = re.compile(rb"<(?:[\w.-]+:)?sheetData\b[^>]*>")
+_ROW_START = re.compile(rb"\s*<(?:[\w.-]+:)?row\b[^>]*>")
+_ROW_END = re.compile(rb"</(?:[\w.-]+:)?row\s*>")
+_ROW_NUMBER = re.compile(rb'\sr="(\d+)"')
+_READ_SIZE = 64 * 1024
+
+
+class _RowsFrom(io.RawIOBase):
+    """Worksheet XML with the `<row>` elements numbered below `first` cut out.
+
+    openpyxl parses every row before `min_row` just to throw it away, which
+    would leave a parse task at the end of a sheet doing nearly all of the
+    work again. Cutting those rows at the byte level costs a regex per row.
+    """
+
+    def __init__(self, source, first: int):
+        self._source = source
+        self._chunks = self._iter_chunks(first)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._pending:
+            self._pending = next(self._chunks, b"")
+            if not self._pending:
+                return 0
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self) -> None:
+        self._source.close()
+        super().close()
+
+    def _iter_chunks(self, first: int) -> Iterator[bytes]:
+        buf = b""
+
+        def fill() -> bool:
+            nonlocal buf
+            data = self._source.read(_READ_SIZE)
+            buf += data
+            return bool(data)
+
+        while (m := _SHEET_DATA.search(buf)) is None:
+            if not fill():
+                yield buf
+                return
+        yield buf[: m.end()]
+        buf, pos = buf[m.end() :], 0
+        if not m.group().endswith(b"/>"):
+            row = 0
+            while True:
+                m = _ROW_START.match(buf, pos)
+                if m is None:
+                    # The next tag is cut off at the end of `buf`, or the rows are over.
+                    if buf.find(b">", pos) == -1 and fill():
+                        continue
+                    break
+                number = _ROW_NUMBER.search(m.group())
+                number = int(number.group(1)) if number else row + 1
+                if number >= first:
+                    break
+                if m.group().endswith(b"/>"):
+                    end = m
+                else:
+                    while (end := _ROW_END.search(buf, m.end())) is None and fill():
+                        pass
+                    if end is None:
+                        break
+                row, pos = number, end.end()
+                if pos > _READ_SIZE:
+                    buf, pos = buf[pos:], 0
+        yield buf[pos:]
+        while data := self._source.read(_READ_SIZE):
+            yield data
+
+
+_range_workbook: tuple[str, object] | None = None
+
+
+def _parse_range(path: str, index_map: dict[str, int], first: int, last: int | None) -> list[tuple]:
+    """Parse-pool task: rows `first` to `last` (None: to the end) of the active sheet, as plain tuples.
+
+    A range that is not the last is padded with blank rows up to `last`, as
+    openpyxl pads gaps inside a sheet, so the writer counts the same skipped
+    rows however the sheet was split.
+    """
+    global _range_workbook
+    # One workbook per worker: the shared strings are read once, not once per range.
+    if _range_workbook is None or _range_workbook[0] != path:
+        if _range_workbook is not None:
+            _range_workbook[1].close()
+        _range_workbook = (path, openpyxl.load_workbook(path, read_only=True, data_only=True))
+    ws = _range_workbook[1].active
+    # `_get_source` is openpyxl's (private) hook for the sheet's XML stream.
+    ws._get_source = lambda: _RowsFrom(type(ws)._get_source(ws), first)
+    rows = [tuple(item) for item in _sheet_rows(ws, index_map, first, last)]
+    if last is not None:
+        rows.extend(tuple(ImportRow(n, "", "", "")) for n in range(first + len(rows), last + 1))
+    return rows
+
+
+_parse_lock = threading.Lock()
+_parse_pool: ProcessPoolExecutor | None = None
+
+
+def _parse_workers() -> ProcessPoolExecutor:
+    global _parse_pool
+    with _parse_lock:
+        if _parse_pool is None:
+            # Spawned, not forked: the parent has DB pools and threads a fork would copy mid-use.
+            _parse_pool = ProcessPoolExecutor(IMPORT_PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _parse_pool
+
+
+def _discard_parse_workers() -> None:
+    global _parse_pool
+    with _parse_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+def _iter_ranges_in_pool(path: str, index_map: dict[str, int], last_row: int) -> Iterator[ImportRow]:
+    """Parse the active sheet in IMPORT_PARSE_RANGE_ROWS ranges across the pool, yielding rows in order.
+
+    At most two ranges per worker are parsed ahead of the writer.
+    """
+    pool = _parse_workers()
+    pending: deque[Future] = deque()
+    try:
+        for first in range(2, last_row + 1, IMPORT_PARSE_RANGE_ROWS):
+            last = first + IMPORT_PARSE_RANGE_ROWS - 1
+            pending.append(pool.submit(_parse_range, path, index_map, first, last if last < last_row else None))
+            if len(pending) >= 2 * IMPORT_PARSE_WORKERS:
+                yield from map(ImportRow._make, pending.popleft().result())
+        while pending:
+            yield from map(ImportRow._make, pending.popleft().result())
+    except BrokenProcessPool:
+        # A worker died; the next import starts a fresh pool.
+        _discard_parse_workers()
+        raise
+    finally:
+        # Drops ranges not started yet when the writer gave up early.
+        for future in pending:
+            future.cancel()
+
+
+def _iter_workbook_rows(path: str) -> Iterator[ImportRow]:
+    """Rows of the active sheet, split by row range across IMPORT_PARSE_WORKERS processes when it is large."""
+    wb = _open_workbook(path)
+    try:
+        ws = wb.active
+        header_row = next(ws.iter_rows(max_row=1, values_only=True), None)
+        if header_row is None:
+            raise HTTPException(status_code=400, detail="Empty sheet")
+        index_map = _resolve_columns(header_row)
+
+        # From the sheet's <dimension>; None when the file has none.
+        last_row = ws.max_row
+        if IMPORT_PARSE_WORKERS > 1 and last_row and last_row - 1 > IMPORT_PARSE_RANGE_ROWS:
+            wb.close()
+            yield from _iter_ranges_in_pool(path, index_map, last_row)
+        else:
+            yield from _sheet_rows(ws, index_map)
+    finally:
+        wb.close()
+
+
+def iter_import_rows(path: str) -> Iterator[ImportRow]:
+    """Stream (row number, salutation, name, title) from the uploaded file.
+
+    The reader is picked by extension. Header problems raise before the first
+    row is yielded, so callers can rely on nothing having been written when an
+    HTTPException comes out of here. NDJSON rows are numbered by line. Rows
+    missing a required field come with `error` set.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".ndjson":
+        yield from map(_checked, _iter_ndjson_rows(path))
+        return
+    if ext != ".csv":
+        yield from _iter_workbook_rows(path)
+        return
+
+    rows_iter = _iter_csv_rows(path)
+    try:
+        header_row = next(rows_iter)
+    except StopIteration:
+        raise HTTPException(status_code=400, detail="Empty sheet")
+
+    index_map = _resolve_columns(header_row)
+
+    # Excel rows are 1-based; header is row 1, data starts at row 2.
+    excel_row_num = 1
+    for row in rows_iter:
+        excel_row_num += 1
+        yield _checked(
+            ImportRow(
+                row=excel_row_num,
+                salutation=_safe_cell_text(row, index_map.get("recipient_salutation")),
+                name=_safe_cell_text(row, index_map.get("recipient_name")),
+                title=_safe_cell_text(row, index_map.get("recipient_title")),
+            )
+        )
+
+
+def _normalized(value: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", value).split()).lower()
+
+
+def import_key(template_id: uuid.UUID, salutation: str, name: str, title: str) -> str:
+    """Stable identity of an imported guest; the import_key migration backfills with the same recipe."""
+    raw = "\x1f".join([str(template_id), _normalized(salutation), _normalized(name), _normalized(title)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ImportProgress(NamedTuple):
+    """What changed since the previous commit; handed to `on_commit` before it runs."""
+
+    last_row: int
+    rows: int
+    created: list[InvitationImportCreatedItem]
+    updated: list[InvitationImportCreatedItem]
+    unchanged: int
+    skipped: int
+    errors: list[InvitationImportErrorItem]
+
+
+class ChunkResult(NamedTuple):
+    created: list[InvitationImportCreatedItem]
+    updated: list[InvitationImportCreatedItem]
+    unchanged: int
+    # Rows repeating a guest an earlier chunk of the same import wrote.
+    duplicates: list[InvitationImportErrorItem]
+    # now() of the transaction that wrote the chunk, if it wrote anything.
+    written_at: datetime | None
+
+
+_IMPORTED_COLUMNS = ("recipient_salutation", "recipient_name", "recipient_title")
+
+
+def _upsert(rows: list[dict]):
+    """Multi-row INSERT that updates guests already imported under the same key.
+
+    The WHERE on the update leaves rows without a real change untouched, and
+    RETURNING reports only the rows written; `inserted` tells the two apart.
+    """
+    stmt = insert(Invitation).values(rows)
+    excluded = stmt.excluded
+    publishes = (excluded.status == InvitationStatus.published) & (Invitation.status == InvitationStatus.draft)
+    return stmt.on_conflict_do_update(
+        index_elements=[Invitation.import_key],
+        index_where=Invitation.import_key.isnot(None),
+        set_={
+            **{c: excluded[c] for c in _IMPORTED_COLUMNS},
+            # A re-upload may publish drafts but never unpublishes a guest.
+            "status": case((publishes, excluded.status), else_=Invitation.status),
+            "slug": func.coalesce(Invitation.slug, excluded.slug),
+            "updated_at": func.now(),
+        },
+        where=or_(publishes, *(getattr(Invitation, c).is_distinct_from(excluded[c]) for c in _IMPORTED_COLUMNS)),
+    ).returning(Invitation.id, Invitation.slug, Invitation.import_key, literal_column("xmax = 0").label("inserted"))
+
+
+def _write_chunk(
+    db: Session,
+    allocator: SlugAllocator,
+    chunk: list[tuple[ImportRow, dict, str | None]],
+    written_at: set[datetime],
+) -> ChunkResult:
+    """Write one chunk; `written_at` holds when this import's earlier chunks were written."""
+    # Guests from earlier uploads: unchanged ones are not sent at all, and
+    # ones that already have a slug keep it. A row an earlier chunk wrote
+    # (updated_at is that transaction's now()) is a guest listed twice in
+    # this file.
+    existing = {
+        row.import_key: row
+        for row in db.execute(
+            select(
+                Invitation.import_key,
+                Invitation.slug,
+                Invitation.status,
+                Invitation.updated_at,
+                *(getattr(Invitation, c) for c in _IMPORTED_COLUMNS),
+            ).where(Invitation.import_key.in_([values["import_key"] for _, values, _ in chunk]))
+        )
+    }
+    pending: list[tuple[ImportRow, dict, str | None]] = []
+    duplicates: list[InvitationImportErrorItem] = []
+    for row, values, base in chunk:
+        old = existing.get(values["import_key"])
+        if old is not None and old.updated_at in written_at:
+            duplicates.append(InvitationImportErrorItem(row=row.row, message="Duplicate of an earlier row"))
+            continue
+        if old is not None:
+            publishes = values["status"] == InvitationStatus.published and old.status == InvitationStatus.draft
+            if not publishes and all(getattr(old, c) == values[c] for c in _IMPORTED_COLUMNS):
+                continue
+            if old.slug:
+                base = None
+        pending.append((row, values, base))
+    if not pending:
+        return ChunkResult([], [], len(chunk) - len(duplicates), duplicates, None)
+
+    bases = [base for _, _, base in pending if base is not None]
+    written = []
+
+    def assign() -> None:
+        # One prefix query per batch of bases instead of one probe per candidate slug.
+        allocator.prefetch(bases)
+        for _, values, base in pending:
+            values["slug"] = allocator.allocate(base) if base is not None else None
+
+    def write() -> None:
+        written[:] = db.execute(_upsert([values for _, values, _ in pending])).all()
+
+    allocator.write(assign, write)
+
+    rows_by_key = {values["import_key"]: row for row, values, _ in pending}
+    created, updated = [], []
+    for invitation_id, slug, key, inserted in written:
+        row = rows_by_key[key]
+        item = InvitationImportCreatedItem(
+            row=row.row, id=invitation_id, slug=slug, action="created" if inserted else "updated"
+        )
+        (created if inserted else updated).append(item)
+    invitation_stats.record_created(db, chunk[0][1]["template_id"], len(created))
+    now = db.execute(select(cast(func.now(), DateTime))).scalar() if written else None
+    return ChunkResult(created, updated, len(chunk) - len(written) - len(duplicates), duplicates, now)
+
+
+def import_file(
+    db: Session,
+    path: str,
+    tpl: InvitationTemplate,
+    status_enum: InvitationStatus,
+    start_row: int = 0,
+    on_commit: Callable[[ImportProgress], None] | None = None,
+) -> InvitationImportResult:
+    """Import the spooled file, committing every IMPORT_CHUNK_SIZE valid rows.
+
+    Guests are matched to earlier uploads by `import_key`: changed ones are
+    updated, identical ones are left alone, and a guest listed twice in the
+    file is reported as an error on the second row (found within a chunk by
+    key, across chunks by the rows earlier chunks wrote, so memory does not
+    grow with the file). A large workbook is parsed by the parse pool (see
+    `_iter_workbook_rows`) while this thread writes.
+
+    Rows numbered `start_row` or lower are skipped, which is how a job resumes.
+    `on_commit` runs inside each chunk's transaction, so whatever it writes is
+    committed atomically with the chunk's invitations.
+    """
+    items: list[InvitationImportCreatedItem] = []
+    errors: list[InvitationImportErrorItem] = []
+    created = updated = unchanged = skipped = 0
+    # One timestamp per committed chunk, not one entry per row.
+    written_at: set[datetime] = set()
+
+    allocator = SlugAllocator(db)
+    version_id = template_content.version_id(db, tpl)
+    chunk: list[tuple[ImportRow, dict, str | None]] = []
+    chunk_rows: dict[str, ImportRow] = {}
+    batch_errors: list[InvitationImportErrorItem] = []
+    batch_skipped = 0
+    batch_rows = 0
+    last_row = start_row
+
+    def commit() -> None:
+        nonlocal chunk, chunk_rows, batch_errors, batch_skipped, batch_rows, created, updated, unchanged, skipped
+        result = _write_chunk(db, allocator, chunk, written_at) if chunk else ChunkResult([], [], 0, [], None)
+        batch_errors.extend(result.duplicates)
+        if on_commit is not None:
+            on_commit(
+                ImportProgress(
+                    last_row, batch_rows, result.created, result.updated, result.unchanged, batch_skipped, batch_errors
+                )
+            )
+        # Commit per chunk so a big import never holds one long transaction open.
+        db.commit()
+        if result.written_at is not None:
+            written_at.add(result.written_at)
+        invitation_cache.invalidate(*(item.slug for item in result.updated))
+        items.extend(result.created)
+        items.extend(result.updated)
+        errors.extend(batch_errors)
+        created += len(result.created)
+        updated += len(result.updated)
+        unchanged += result.unchanged
+        skipped += batch_skipped
+        chunk, chunk_rows, batch_errors, batch_skipped, batch_rows = [], {}, [], 0, 0
+
+    for item in iter_import_rows(path):
+        if item.row <= start_row:
+            continue
+        last_row = item.row
+        batch_rows += 1
+
+        # Required fields were checked by the reader.
+        if item.error:
+            batch_errors.append(InvitationImportErrorItem(row=item.row, message=item.error))
+            continue
+        if not item.name and not item.title and not item.salutation:
+            batch_skipped += 1
+            continue
+
+        salutation = item.salutation or "Ông"
+        key = import_key(tpl.id, salutation, item.name, item.title)
+        first = chunk_rows.get(key)
+        if first is not None:
+            batch_errors.append(InvitationImportErrorItem(row=item.row, message=f"Duplicate of row {first.row}"))
+            continue
+        chunk_rows[key] = item
+
+        # Client-side ids so rows can go out in one multi-row INSERT. The
+        # template's content is not copied: unset shared fields inherit it.
+        values = {
+            "id": uuid.uuid4(),
+            "template_id": tpl.id,
+            "template_version_id": version_id,
+            "recipient_salutation": salutation,
+            "recipient_name": item.name,
+            "recipient_title": item.title,
+            "status": status_enum,
+            "slug": None,
+            "import_key": key,
+        }
+        base = slug_base(tpl.title, item.name) if status_enum == InvitationStatus.published else None
+        chunk.append((item, values, base))
+
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            commit()
+
+    commit()
+
+    return InvitationImportResult(
+        created=created, updated=updated, unchanged=unchanged, skipped=skipped, items=items, errors=errors
+    )
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.orm import Session
+
+from app.models.invitation_stats import InvitationStats
+from app.models.rsvp import RsvpStatus
+
+# Summary key for invitations that are not linked to a template.
+NO_TEMPLATE = UUID(int=0)
+
+COUNTERS = ("invited", "pending", "attending", "declined", "headcount")
+_STATUS_COUNTER = {
+    RsvpStatus.PENDING: "pending",
+    RsvpStatus.ATTENDING: "attending",
+    RsvpStatus.DECLINED: "declined",
+}
+
+
+def _key(template_id: UUID | None) -> UUID:
+    return template_id or NO_TEMPLATE
+
+
+def adjust_stmt(template_id: UUID | None, **deltas: int) -> Insert | None:
+    """Upsert adding `deltas` to the template's summary row, or None if all are zero.
+
+    The increment happens in the UPDATE itself, which keeps concurrent writers
+    from losing each other's counts.
+    """
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return None
+    stmt = insert(InvitationStats).values(template_id=_key(template_id), **{c: deltas.get(c, 0) for c in COUNTERS})
+    return stmt.on_conflict_do_update(
+        index_elements=[InvitationStats.template_id],
+        set_={
+            **{c: getattr(InvitationStats, c) + stmt.excluded[c] for c in deltas},
+            "updated_at": func.now(),
+        },
+    )
+
+
+def adjust(db: Session, template_id: UUID | None, **deltas: int) -> None:
+    """Apply `deltas` in the caller's transaction, so the totals commit or roll
+    back together with the invitation write they describe."""
+    stmt = adjust_stmt(template_id, **deltas)
+    if stmt is not None:
+        db.execute(stmt)
+
+
+def record_created(db: Session, template_id: UUID | None, count: int = 1) -> None:
+    adjust(db, template_id, invited=count, pending=count)
+
+
+def record_deleted(db: Session, template_id: UUID | None, status: RsvpStatus, attendee_count: int) -> None:
+    record_deleted_many(db, [(template_id, status, attendee_count)])
+
+
+def record_deleted_many(db: Session, rows: Iterable[tuple[UUID | None, RsvpStatus, int]]) -> None:
+    """Subtract deleted (template_id, rsvp_status, attendee_count) rows, one upsert per template."""
+    deltas: dict[UUID | None, dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for template_id, status, attendee_count in rows:
+        d = deltas[template_id]
+        d["invited"] -= 1
+        d["headcount"] -= attendee_count or 0
+        d[_STATUS_COUNTER[status]] -= 1
+    for template_id, d in deltas.items():
+        adjust(db, template_id, **d)
+
+
+def detach_template(db: Session, template_id: UUID) -> None:
+    """Fold a template's totals into NO_TEMPLATE; its invitations are about to lose the link."""
+    row = db.get(InvitationStats, template_id)
+    if row is None:
+        return
+    adjust(db, None, **{c: getattr(row, c) for c in COUNTERS})
+    db.delete(row)
+
+
+def totals(db: Session, template_id: UUID | None = None) -> dict[str, int]:
+    """Counters for one template, or summed over all of them."""
+    stmt = select(*(func.coalesce(func.sum(getattr(InvitationStats, c)), 0) for c in COUNTERS))
+    if template_id is not None:
+        stmt = stmt.where(InvitationStats.template_id == template_id)
+    return dict(zip(COUNTERS, (int(v) for v in db.execute(stmt).one())))
@@ -0,0 +1,211 @@
+"""Per-route request and database metrics.
+
+`MetricsMiddleware` times every HTTP request and labels it with the matched
+route template (`/api/invitations/{slug}`), never the raw path. Engine events
+attribute each SQL statement, its duration and the rows it returned to the
+request running it through a context variable, which follows the request into
+the threadpool and into the async engine's greenlets. Statements run by
+background threads (import jobs, the RSVP flusher) are not attributed. Rows
+are the driver's rowcount, so server-side cursors (the streamed export) count
+none.
+"""
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Adds `Server-Timing: app;dur=..., db;dur=...;desc="N queries"` to responses.
+METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "0").lower() not in ("0", "false", "no")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class _RequestDb:
+    __slots__ = ("queries", "seconds", "rows")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+        self.rows = 0
+
+
+_current: ContextVar[_RequestDb | None] = ContextVar("request_db", default=None)
+
+
+class RouteStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+
+
+class _Key(NamedTuple):
+    method: str
+    route: str
+
+
+_lock = threading.Lock()
+_routes: dict[_Key, RouteStats] = {}
+
+
+def _record(key: _Key, seconds: float, status: int, db: _RequestDb) -> None:
+    with _lock:
+        stats = _routes.get(key)
+        if stats is None:
+            stats = _routes[key] = RouteStats()
+        stats.requests += 1
+        stats.errors += status >= 500
+        stats.seconds += seconds
+        stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        stats.queries += db.queries
+        stats.db_seconds += db.seconds
+        stats.rows += db.rows
+
+
+def snapshot() -> dict[_Key, RouteStats]:
+    with _lock:
+        copy = {}
+        for key, stats in _routes.items():
+            c = copy[key] = RouteStats()
+            c.__dict__.update(stats.__dict__, buckets=list(stats.buckets))
+        return copy
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info["query_start"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    db = _current.get()
+    started = conn.info.pop("query_start", None)
+    if db is None or started is None:
+        return
+    db.queries += 1
+    db.seconds += time.perf_counter() - started
+    if cursor.description is not None:
+        db.rows += max(cursor.rowcount, 0)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses are not buffered."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        db = _RequestDb()
+        token = _current.set(db)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if METRICS_SERVER_TIMING:
+                    timing = (
+                        f"app;dur={(time.perf_counter() - start) * 1000:.1f}, "
+                        f'db;dur={db.seconds * 1000:.1f};desc="{db.queries} queries"'
+                    )
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            key = _Key(scope["method"], getattr(route, "path", UNMATCHED_ROUTE))
+            _record(key, time.perf_counter() - start, status, db)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _le(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def render_prometheus(pools: dict[str, dict]) -> str:
+    """Text exposition format: per-route metrics plus the given pool statuses."""
+    out: list[str] = []
+
+    def family(name: str, kind: str, help_text: str) -> None:
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+
+    routes = sorted(snapshot().items())
+    labels = {key: f'method="{key.method}",route="{_escape(key.route)}"' for key, _ in routes}
+
+    family("http_requests_total", "counter", "Requests handled, by route template.")
+    for key, s in routes:
+        out.append(f"http_requests_total{{{labels[key]}}} {s.requests}")
+    family("http_request_errors_total", "counter", "Requests answered with a 5xx status.")
+    for key, s in routes:
+        out.append(f"http_request_errors_total{{{labels[key]}}} {s.errors}")
+    family("http_request_duration_seconds", "histogram", "Time to the end of the response.")
+    for key, s in routes:
+        total = 0
+        for bound, count in zip((*LATENCY_BUCKETS, float("inf")), s.buckets):
+            total += count
+            out.append(f'http_request_duration_seconds_bucket{{{labels[key]},le="{_le(bound)}"}} {total}')
+        out.append(f"http_request_duration_seconds_sum{{{labels[key]}}} {s.seconds:.6f}")
+        out.append(f"http_request_duration_seconds_count{{{labels[key]}}} {s.requests}")
+    family("http_db_queries_total", "counter", "SQL statements executed while handling requests.")
+    for key, s in routes:
+        out.append(f"http_db_queries_total{{{labels[key]}}} {s.queries}")
+    family("http_db_seconds_total", "counter", "Time spent executing SQL statements.")
+    for key, s in routes:
+        out.append(f"http_db_seconds_total{{{labels[key]}}} {s.db_seconds:.6f}")
+    family("http_db_rows_total", "counter", "Rows returned by SQL statements.")
+    for key, s in routes:
+        out.append(f"http_db_rows_total{{{labels[key]}}} {s.rows}")
+
+    gauges = (
+        ("db_pool_size", "size", "Configured pool size."),
+        ("db_pool_checked_out", "checked_out", "Connections currently checked out."),
+        ("db_pool_overflow", "overflow", "Connections open beyond the pool size."),
+    )
+    for name, field, help_text in gauges:
+        family(name, "gauge", help_text)
+        for engine_name, st in pools.items():
+            if field in st:
+                out.append(f'{name}{{engine="{engine_name}"}} {st[field]}')
+    family("db_pool_checkouts_total", "counter", "Connection checkouts.")
+    for engine_name, st in pools.items():
+        if "checkouts" in st:
+            out.append(f'db_pool_checkouts_total{{engine="{engine_name}"}} {st["checkouts"]}')
+    family("db_pool_timeouts_total", "counter", "Checkouts that gave up waiting for a connection.")
+    for engine_name, st in pools.items():
+        if "timeouts" in st:
+            out.append(f'db_pool_timeouts_total{{engine="{engine_name}"}} {st["timeouts"]}')
+    family("db_pool_checkout_wait_seconds", "histogram", "Time spent waiting for a pooled connection.")
+    for engine_name, st in pools.items():
+        if "wait_histogram" not in st:
+            continue
+        for b in st["wait_histogram"]:
+            out.append(f'db_pool_checkout_wait_seconds_bucket{{engine="{engine_name}",le="{_le(b["le"])}"}} {b["count"]}')
+        out.append(f'db_pool_checkout_wait_seconds_sum{{engine="{engine_name}"}} {st["wait_seconds_sum"]}')
+        out.append(f'db_pool_checkout_wait_seconds_count{{engine="{engine_name}"}} {st["checkouts"]}')
+
+    return "\n".join(out) + "\n"
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson, for handlers that build plain dicts.
+
+    orjson serializes UUID, datetime and Enum values itself, so rows can be
+    returned without a pydantic model in between.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import TextClause, text
+
+from app.core.invitation_stats import NO_TEMPLATE
+from app.models.rsvp import RsvpStatus
+
+# One round trip per RSVP: lock and update the invitation (keeping its old
+# answer for the summary delta), upsert the single response row, and adjust
+# the per-template totals. Returns no row if the slug is not published, or if
+# :answered_at is set and the stored answer is not older than it.
+_RSVP_UPSERT = text(
+    """
+    WITH target AS (
+        SELECT id, template_id, rsvp_status, attendee_count
+        FROM invitations
+        WHERE slug = :slug AND status = 'published'
+          AND NOT EXISTS (
+            SELECT 1 FROM invitation_responses r
+            WHERE r.invitation_id = invitations.id AND r.created_at >= CAST(:answered_at AS timestamp)
+          )
+        FOR UPDATE
+    ),
+    inv AS (
+        UPDATE invitations i
+        SET rsvp_status = CAST(:response AS rsvpstatus),
+            attendee_count = :invitation_count,
+            updated_at = now()
+        FROM target t
+        WHERE i.id = t.id
+        RETURNING i.id, t.template_id, t.rsvp_status AS old_status, t.attendee_count AS old_count
+    ),
+    resp AS (
+        INSERT INTO invitation_responses (id, invitation_id, responder_id, response, attendee_count, created_at)
+        SELECT :response_id, id, id, CAST(:response AS rsvpstatus), :attendee_count,
+               COALESCE(CAST(:answered_at AS timestamp), now())
+        FROM inv
+        ON CONFLICT (invitation_id) DO UPDATE
+        SET response = EXCLUDED.response, attendee_count = EXCLUDED.attendee_count, created_at = EXCLUDED.created_at
+        WHERE CAST(:answered_at AS timestamp) IS NULL OR invitation_responses.created_at < EXCLUDED.created_at
+        RETURNING id, invitation_id, response, attendee_count, created_at
+    ),
+    stats AS (
+        INSERT INTO invitation_stats (template_id, invited, pending, attending, declined, headcount, updated_at)
+        SELECT
+            COALESCE(template_id, :no_template),
+            0,
+            (CAST(:response AS rsvpstatus) = 'PENDING')::int - (old_status = 'PENDING')::int,
+            (CAST(:response AS rsvpstatus) = 'ATTENDING')::int - (old_status = 'ATTENDING')::int,
+            (CAST(:response AS rsvpstatus) = 'DECLINED')::int - (old_status = 'DECLINED')::int,
+            :invitation_count - old_count,
+            now()
+        FROM inv
+        ON CONFLICT (template_id) DO UPDATE
+        SET pending = invitation_stats.pending + EXCLUDED.pending,
+            attending = invitation_stats.attending + EXCLUDED.attending,
+            declined = invitation_stats.declined + EXCLUDED.declined,
+            headcount = invitation_stats.headcount + EXCLUDED.headcount,
+            updated_at = now()
+    )
+    SELECT id, invitation_id, response, attendee_count, created_at FROM resp
+    """
+)
+
+
+def invitation_count(response_value: RsvpStatus, attendee_count: int) -> int:
+    """Headcount an answer contributes to `invitations.attendee_count`."""
+    return attendee_count if response_value == RsvpStatus.ATTENDING else 0
+
+
+def upsert_statement(
+    slug: str,
+    response_value: RsvpStatus,
+    attendee_count: int,
+    response_id: uuid.UUID | None = None,
+    answered_at: datetime | None = None,
+) -> TextClause:
+    """The RSVP upsert bound for one answer; `attendee_count` is already validated.
+
+    `response_id` is used only when the invitation has no response row yet.
+    `answered_at` (UTC) is when a journaled answer was given: it becomes the
+    response's `created_at`, and the answer is skipped if the stored one is
+    not older. Without it the answer is stamped now() and always applied.
+    The ORM does not see this write, so callers must `changes.mark()` the session.
+    """
+    return _RSVP_UPSERT.bindparams(
+        slug=slug,
+        response=response_value.value,
+        attendee_count=attendee_count,
+        invitation_count=invitation_count(response_value, attendee_count),
+        response_id=response_id or uuid.uuid4(),
+        answered_at=answered_at,
+        no_template=NO_TEMPLATE,
+    )
@@ -0,0 +1,289 @@
+"""Optional write-behind mode for RSVPs (RSVP_WRITE_BEHIND=1).
+
+Validated answers are appended to a local journal, fsync'd, acknowledged and
+queued. A flusher thread writes the queue to Postgres in one transaction per
+batch, every RSVP_FLUSH_INTERVAL_MS or as soon as RSVP_FLUSH_MAX_ITEMS are
+waiting. Until its batch commits, an answer is overlaid on the public view of
+its invitation so the guest reads their own write.
+
+Each process journals into its own segment files under RSVP_JOURNAL_DIR,
+guarded by an flock'd lock file. A batch's segment is deleted once the batch
+commits. At startup, segments whose lock is no longer held (the process
+died) are replayed. Each answer is written with the time it was journaled
+and skipped if the stored answer is not older, so replaying one that already
+committed, or one a guest has since changed through another worker, leaves
+the newer answer in place.
+"""
+from __future__ import annotations
+
+import fcntl
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+
+from app.core import changes, invitation_cache, rsvp
+from app.core.database import SessionLocal
+from app.models.rsvp import RsvpStatus
+
+logger = logging.getLogger(__name__)
+
+RSVP_WRITE_BEHIND = os.getenv("RSVP_WRITE_BEHIND", "0").lower() not in ("0", "false", "no")
+RSVP_FLUSH_INTERVAL_MS = int(os.getenv("RSVP_FLUSH_INTERVAL_MS", 50))
+RSVP_FLUSH_MAX_ITEMS = int(os.getenv("RSVP_FLUSH_MAX_ITEMS", 500))
+# Must be on persistent storage (a volume in Docker) for acknowledged answers
+# to survive a crash.
+RSVP_JOURNAL_DIR = os.getenv("RSVP_JOURNAL_DIR", "rsvp-journal")
+# Pause between attempts while Postgres is unreachable.
+FLUSH_RETRY_SECONDS = 1.0
+# How long shutdown waits for the final flush; whatever is left stays in the
+# journal and is replayed by the next start.
+SHUTDOWN_FLUSH_SECONDS = 30.0
+
+
+class PendingRsvp(NamedTuple):
+    slug: str
+    invitation_id: uuid.UUID
+    response: RsvpStatus
+    attendee_count: int
+    response_id: uuid.UUID
+    created_at: datetime
+
+    def to_json(self) -> bytes:
+        return json.dumps(
+            {
+                "slug": self.slug,
+                "invitation_id": str(self.invitation_id),
+                "response": self.response.value,
+                "attendee_count": self.attendee_count,
+                "response_id": str(self.response_id),
+                "created_at": self.created_at.isoformat(),
+            }
+        ).encode() + b"\n"
+
+    @classmethod
+    def from_json(cls, line: bytes) -> PendingRsvp:
+        d = json.loads(line)
+        return cls(
+            d["slug"],
+            uuid.UUID(d["invitation_id"]),
+            RsvpStatus(d["response"]),
+            int(d["attendee_count"]),
+            uuid.UUID(d["response_id"]),
+            datetime.fromisoformat(d["created_at"]),
+        )
+
+
+class _Journal:
+    """Append-only segment files owned by this process."""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self._prefix = os.path.join(directory, f"rsvp-{uuid.uuid4().hex}")
+        self._lock_fd = os.open(f"{self._prefix}.lock", os.O_CREAT | os.O_RDWR, 0o600)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._seq = 0
+        self._file = open(self._segment(0), "ab")
+
+    def _segment(self, seq: int) -> str:
+        return f"{self._prefix}.{seq:08d}.ndjson"
+
+    def append(self, item: PendingRsvp) -> None:
+        self._file.write(item.to_json())
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def rotate(self) -> str:
+        """Close the active segment and return its path; new appends go to a fresh one."""
+        self._file.close()
+        closed = self._segment(self._seq)
+        self._seq += 1
+        self._file = open(self._segment(self._seq), "ab")
+        return closed
+
+    def close(self) -> None:
+        """Remove the (flushed) active segment and release the lock."""
+        self._file.close()
+        os.unlink(self._segment(self._seq))
+        os.unlink(f"{self._prefix}.lock")
+        os.close(self._lock_fd)
+
+
+_lock = threading.Lock()
+_wakeup = threading.Condition(_lock)
+_pending: list[PendingRsvp] = []
+# Latest unflushed answer per slug, queued or in the batch being written.
+_latest: dict[str, PendingRsvp] = {}
+_journal: _Journal | None = None
+_flusher: threading.Thread | None = None
+_stopping = False
+
+
+def submit(slug: str, invitation_id: uuid.UUID, response_value: RsvpStatus, attendee_count: int) -> PendingRsvp:
+    """Journal and queue an answer; once this returns, the answer survives a crash."""
+    item = PendingRsvp(slug, invitation_id, response_value, attendee_count, uuid.uuid4(), datetime.utcnow())
+    with _lock:
+        if _journal is None:
+            raise RuntimeError("RSVP write-behind is not running")
+        _journal.append(item)
+        _pending.append(item)
+        _latest[slug] = item
+        if len(_pending) >= RSVP_FLUSH_MAX_ITEMS:
+            _wakeup.notify()
+    return item
+
+
+def overlay(slug: str, entry: invitation_cache.CachedInvitation | None) -> invitation_cache.CachedInvitation | None:
+    """The public view of `slug` with its unflushed answer, if any, applied."""
+    with _lock:
+        item = _latest.get(slug)
+    if item is None or entry is None:
+        return entry
+    body = json.loads(entry.body)
+    body["rsvp_status"] = item.response.value
+    body["attendee_count"] = rsvp.invitation_count(item.response, item.attendee_count)
+    return invitation_cache.make_entry(entry.id, json.dumps(body, ensure_ascii=False).encode())
+
+
+def _write(batch: list[PendingRsvp]) -> None:
+    """Write a batch in one transaction, falling back to one per answer if a row is rejected.
+
+    Only an answer the database rejects as data (IntegrityError, DataError)
+    is dropped. Any other error (connection refused or lost, pool timeout)
+    propagates so the caller retries the whole batch and keeps its journal.
+    """
+    db = SessionLocal()
+    try:
+        try:
+            for item in batch:
+                db.execute(_statement(item))
+            changes.mark(db)
+            db.commit()
+            return
+        except (IntegrityError, DataError):
+            db.rollback()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+
+        for item in batch:
+            try:
+                db.execute(_statement(item))
+                changes.mark(db)
+                db.commit()
+            except (IntegrityError, DataError):
+                db.rollback()
+                logger.exception("Dropping RSVP for %s", item.slug)
+    finally:
+        db.close()
+
+
+def _statement(item: PendingRsvp):
+    return rsvp.upsert_statement(item.slug, item.response, item.attendee_count, item.response_id, item.created_at)
+
+
+def _write_until_done(batch: list[PendingRsvp]) -> None:
+    while True:
+        try:
+            _write(batch)
+            return
+        except SQLAlchemyError:
+            logger.exception("RSVP flush failed; retrying")
+            time.sleep(FLUSH_RETRY_SECONDS)
+
+
+def _flush_loop() -> None:
+    while True:
+        with _lock:
+            deadline = time.monotonic() + RSVP_FLUSH_INTERVAL_MS / 1000
+            while len(_pending) < RSVP_FLUSH_MAX_ITEMS and not _stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                _wakeup.wait(remaining)
+            if not _pending:
+                if _stopping:
+                    return
+                continue
+            batch = list(_pending)
+            _pending.clear()
+            segment = _journal.rotate()
+
+        _write_until_done(batch)
+        os.unlink(segment)
+        invitation_cache.invalidate(*{item.slug for item in batch})
+        with _lock:
+            for item in batch:
+                if _latest.get(item.slug) is item:
+                    del _latest[item.slug]
+
+
+def _read_segment(path: str) -> list[PendingRsvp]:
+    items = []
+    with open(path, "rb") as fh:
+        for line in fh:
+            try:
+                items.append(PendingRsvp.from_json(line))
+            except (ValueError, KeyError):
+                # A torn final line was never acknowledged.
+                logger.warning("Skipping unreadable RSVP journal line in %s", path)
+    return items
+
+
+def _recover(directory: str) -> None:
+    """Replay journals left by processes that died before flushing them."""
+    for lock_path in glob.glob(os.path.join(directory, "rsvp-*.lock")):
+        fd = os.open(lock_path, os.O_RDWR)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue  # a live process owns it
+            prefix = lock_path[: -len(".lock")]
+            segments = sorted(glob.glob(f"{glob.escape(prefix)}.*.ndjson"))
+            for path in segments:
+                items = _read_segment(path)
+                for start in range(0, len(items), RSVP_FLUSH_MAX_ITEMS):
+                    _write(items[start : start + RSVP_FLUSH_MAX_ITEMS])
+                os.unlink(path)
+                logger.info("Replayed %d RSVPs from %s", len(items), path)
+            os.unlink(lock_path)
+        except SQLAlchemyError:
+            logger.exception("RSVP journal replay failed; will retry on next start")
+        finally:
+            os.close(fd)
+
+
+def start() -> None:
+    global _journal, _flusher, _stopping
+    _recover(RSVP_JOURNAL_DIR)
+    with _lock:
+        _stopping = False
+        _journal = _Journal(RSVP_JOURNAL_DIR)
+    _flusher = threading.Thread(target=_flush_loop, name="rsvp-flusher", daemon=True)
+    _flusher.start()
+
+
+def stop() -> None:
+    """Flush what is queued, then close the journal."""
+    global _journal, _flusher, _stopping
+    if _flusher is None:
+        return
+    with _lock:
+        _stopping = True
+        _wakeup.notify()
+    _flusher.join(SHUTDOWN_FLUSH_SECONDS)
+    if _flusher.is_alive():
+        logger.warning("RSVP flush did not finish; unflushed answers stay in %s", RSVP_JOURNAL_DIR)
+        return
+    with _lock:
+        _journal.close()
+        _journal = None
+    _flusher = None
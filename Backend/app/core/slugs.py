@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+from slugify import slugify
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.invitation import Invitation
+
+# Bases per prefix query; keeps the OR list (and bind params) bounded for big imports.
+PREFETCH_CHUNK = 500
+RETRY_ATTEMPTS = 5
+
+
+def slug_base(title: str, recipient_name: str) -> str:
+    return slugify(f"{title}-{recipient_name}")
+
+
+def is_slug_conflict(exc: IntegrityError) -> bool:
+    return "slug" in str(exc.orig)
+
+
+def _like_prefix(base: str) -> str:
+    escaped = base.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}-%"
+
+
+class SlugAllocator:
+    """Hands out unique invitation slugs with one prefix query per batch of bases.
+
+    Taken slugs are cached for the lifetime of the allocator, so a
+    request should use a single instance for all the rows it writes.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._loaded: set[str] = set()
+        # Slugs known to be taken across all bases: another base's suffixed slug
+        # can equal this base's candidate ("a-b" + "-5" vs a guest named "b 5").
+        self._used: set[str] = set()
+        self._next_suffix: dict[str, int] = {}
+
+    def prefetch(self, bases: Iterable[str]) -> None:
+        missing = sorted({b for b in bases if b not in self._loaded})
+        for start in range(0, len(missing), PREFETCH_CHUNK):
+            chunk = missing[start : start + PREFETCH_CHUNK]
+            conditions = [or_(Invitation.slug == b, Invitation.slug.like(_like_prefix(b), escape="\\")) for b in chunk]
+            self._used.update(slug for (slug,) in self.db.query(Invitation.slug).filter(or_(*conditions)))
+            self._loaded.update(chunk)
+
+    def allocate(self, base: str) -> str:
+        if base not in self._loaded:
+            self.prefetch([base])
+        candidate = base
+        suffix = self._next_suffix.get(base, 2)
+        while candidate in self._used:
+            candidate = f"{base}-{suffix}"
+            suffix += 1
+        self._used.add(candidate)
+        self._next_suffix[base] = suffix
+        return candidate
+
+    def reset(self) -> None:
+        self._loaded.clear()
+        self._used.clear()
+        self._next_suffix.clear()
+
+    def write(self, assign: Callable[[], None], write: Callable[[], None]) -> None:
+        """Run `assign` then `write` in a savepoint, re-allocating on a slug race.
+
+        A concurrent writer may take a slug between our prefix query and the
+        INSERT; only the savepoint is rolled back, the cache is dropped so the
+        next attempt sees the winner's rows, and slugs are handed out again.
+        """
+        for attempt in range(RETRY_ATTEMPTS):
+            assign()
+            try:
+                with self.db.begin_nested():
+                    write()
+                return
+            except IntegrityError as exc:
+                if attempt + 1 >= RETRY_ATTEMPTS or not is_slug_conflict(exc):
+                    raise
+                self.reset()
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Iterable
+from uuid import UUID
+
+from sqlalchemy import and_, case, cast, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from app.core.cache import TTLCache
+from app.models.invitation import Invitation
+from app.models.template import InvitationTemplate, InvitationTemplateVersion
+
+# Invitation columns that fall back to the linked template version's value when NULL.
+TEMPLATE_FIELDS = ("title", "company_name", "content", "event_time", "event_location", "google_map_url", "schedule")
+
+# Invitations rewritten per transaction when a template edit is propagated.
+TEMPLATE_PROPAGATE_BATCH_SIZE = int(os.getenv("TEMPLATE_PROPAGATE_BATCH_SIZE", 1000))
+
+# Versions never change, so cached values cannot go stale; no TTL needed.
+TEMPLATE_CACHE_SIZE = int(os.getenv("TEMPLATE_CACHE_SIZE", 256))
+
+# Stored instead of NULL when an invitation must keep "no value" while its
+# template has one; read back as None.
+_EMPTY = {"google_map_url": "", "schedule": []}
+
+_INVITATION_COLUMNS = tuple(attr.key for attr in Invitation.__mapper__.column_attrs)
+_cache = TTLCache(TEMPLATE_CACHE_SIZE)
+
+
+def _select(version_id: UUID):
+    return select(*(getattr(InvitationTemplateVersion, f) for f in TEMPLATE_FIELDS)).where(
+        InvitationTemplateVersion.id == version_id
+    )
+
+
+def get(db: Session, version_id: UUID | None) -> dict[str, Any] | None:
+    """A template version's shared values, or None if the invitation has no template."""
+    if version_id is None:
+        return None
+    values = _cache.get(version_id)
+    if values is None:
+        row = db.execute(_select(version_id)).one_or_none()
+        if row is None:
+            return None
+        values = dict(zip(TEMPLATE_FIELDS, row))
+        _cache.set(version_id, values)
+    return values
+
+
+async def aget(db: AsyncSession, version_id: UUID | None) -> dict[str, Any] | None:
+    if version_id is None:
+        return None
+    values = _cache.get(version_id)
+    if values is None:
+        row = (await db.execute(_select(version_id))).one_or_none()
+        if row is None:
+            return None
+        values = dict(zip(TEMPLATE_FIELDS, row))
+        _cache.set(version_id, values)
+    return values
+
+
+def get_many(db: Session, version_ids: Iterable[UUID | None]) -> dict[UUID, dict[str, Any]]:
+    found = {}
+    for version_id in set(version_ids):
+        values = get(db, version_id)
+        if values is not None:
+            found[version_id] = values
+    return found
+
+
+def new_version(db: Session, template: InvitationTemplate) -> UUID:
+    """Store the template's shared values as a new version and make it current.
+
+    Invitations stay on the version they point at, so existing ones keep
+    showing what they showed; only new invitations and a propagated edit
+    pick up the new version.
+    """
+    version = InvitationTemplateVersion(template_id=template.id, **{f: getattr(template, f) for f in TEMPLATE_FIELDS})
+    db.add(version)
+    db.flush()
+    template.current_version_id = version.id
+    return version.id
+
+
+def version_id(db: Session, template: InvitationTemplate) -> UUID:
+    """The template's current version, adding a first one for a template that has none yet."""
+    return template.current_version_id or new_version(db, template)
+
+
+def resolve(invitation: Invitation, template: dict[str, Any] | None) -> dict[str, Any]:
+    """The invitation's column values with its NULL shared fields taken from `template`."""
+    return resolve_values({key: getattr(invitation, key) for key in _INVITATION_COLUMNS}, template)
+
+
+def resolve_values(data: dict[str, Any], template: dict[str, Any] | None) -> dict[str, Any]:
+    """`resolve` for a dict of selected columns; fields not in `data` are left out. Mutates `data`."""
+    for field in TEMPLATE_FIELDS:
+        if field in data:
+            if data[field] is None and template is not None:
+                data[field] = template[field]
+            if field in _EMPTY and data[field] == _EMPTY[field]:
+                data[field] = None
+    return data
+
+
+def overrides(values: dict[str, Any], template: dict[str, Any], sent: Iterable[str] = ()) -> dict[str, Any]:
+    """`values` with the shared fields equal to the template's set to None, so they are not stored per row.
+
+    A field named in `sent` (set by the client) that is None while the
+    template has a value is stored as its `_EMPTY` marker, so it stays
+    cleared instead of inheriting.
+    """
+    sent = set(sent)
+    data = {}
+    for key, value in values.items():
+        if key in TEMPLATE_FIELDS and value == template[key]:
+            value = None
+        elif value is None and key in sent and key in _EMPTY:
+            value = _EMPTY[key]
+        data[key] = value
+    return data
+
+
+def effective_column(field: str):
+    """SQL expression for an invitation's effective value of a shared field.
+
+    A correlated subquery rather than a join, so it can be used in
+    SELECT ... FOR UPDATE.
+    """
+    inherited = (
+        select(getattr(InvitationTemplateVersion, field))
+        .where(InvitationTemplateVersion.id == Invitation.template_version_id)
+        .scalar_subquery()
+    )
+    return func.coalesce(getattr(Invitation, field), inherited).label(field)
+
+
+def _comparable(field: str, column):
+    """`column` in a form where values that read back the same compare equal."""
+    if field == "schedule":
+        # json has no equality operator in Postgres; jsonb does. A JSON null,
+        # SQL NULL and the [] marker all read back as no schedule.
+        value = func.nullif(cast(column, JSONB), cast(literal("null"), JSONB))
+        return func.coalesce(value, cast(literal("[]"), JSONB))
+    if field in _EMPTY:
+        return func.coalesce(column, _EMPTY[field])
+    return column
+
+
+def propagate(db: Session, template_id: UUID, version_id: UUID) -> int:
+    """Move the template's invitations to `version_id`; returns how many now show different content.
+
+    A field an invitation stores with the same value as the version it was
+    on (a copy pinned there, not a customisation) is reset to inherit, so
+    it follows the template from now on. Runs even when the edit changed
+    nothing, to bring along invitations left on older versions. Works in
+    TEMPLATE_PROPAGATE_BATCH_SIZE batches keyed on id, one UPDATE and commit
+    each.
+    """
+    current = aliased(InvitationTemplateVersion)
+    target = aliased(InvitationTemplateVersion)
+    pinned, changed = [], []
+    for field in TEMPLATE_FIELDS:
+        column = getattr(Invitation, field)
+        was = _comparable(field, getattr(current, field))
+        same = _comparable(field, column) == was
+        pinned.append(same)
+        changed.append(and_(or_(column.is_(None), same), was.is_distinct_from(_comparable(field, getattr(target, field)))))
+    assignments = {
+        "template_version_id": version_id,
+        **{field: case((same, None), else_=getattr(Invitation, field)) for field, same in zip(TEMPLATE_FIELDS, pinned)},
+    }
+    select_rows = (
+        select(Invitation.id, or_(*changed))
+        .join(current, current.id == Invitation.template_version_id)
+        .join(target, target.id == version_id)
+        .where(Invitation.template_id == template_id, or_(Invitation.template_version_id != version_id, *pinned))
+        .order_by(Invitation.id)
+        .limit(TEMPLATE_PROPAGATE_BATCH_SIZE)
+        .with_for_update(of=Invitation)
+    )
+
+    count, last_id = 0, None
+    while True:
+        stmt = select_rows if last_id is None else select_rows.where(Invitation.id > last_id)
+        rows = db.execute(stmt).all()
+        if not rows:
+            return count
+        ids = [row[0] for row in rows]
+        db.execute(
+            update(Invitation)
+            .where(Invitation.id.in_(ids), current.id == Invitation.template_version_id)
+            .values(assignments)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        count += sum(1 for row in rows if row[1])
+        last_id = ids[-1]
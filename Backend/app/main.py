@@ -1,11 +1,31 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core import import_jobs, rsvp_buffer
+from app.core.compression import CompressionMiddleware
+from app.core.database import async_engine
+from app.core.request_metrics import MetricsMiddleware
 from app.routers.auth import router as auth_router
 from app.routers.invitation import router as invitation_router
+from app.routers.metrics import exposition_router as metrics_exposition_router
+from app.routers.metrics import router as metrics_router
 from app.routers.template import router as template_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    import_jobs.resume_pending()
+    if rsvp_buffer.RSVP_WRITE_BEHIND:
+        rsvp_buffer.start()
+    yield
+    rsvp_buffer.stop()
+    import_jobs.shutdown()
+    await async_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,8 +33,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count", "Server-Timing", "X-Propagated-Count"],
 )
+app.add_middleware(CompressionMiddleware)
+# Outermost, so its timings include CORS handling and compression.
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth_router)
 app.include_router(invitation_router)
 app.include_router(template_router)
+app.include_router(metrics_router)
+app.include_router(metrics_exposition_router)
@@ -1,6 +1,8 @@
 from .base import Base
+from .import_job import ImportJob, ImportJobState
 from .invitation import Invitation, InvitationStatus
 from .invitation_response import InvitationResponse
+from .invitation_stats import InvitationStats
 from .rsvp import RsvpStatus
-from .template import InvitationTemplate
+from .template import InvitationTemplate, InvitationTemplateVersion
 from .user import User
@@ -0,0 +1,40 @@
+import enum
+import uuid
+
+from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.base import Base
+
+
+class ImportJobState(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    template_id = Column(UUID(as_uuid=True), ForeignKey("invitation_templates.id", ondelete="CASCADE"), nullable=False)
+    invitation_status = Column(String(16), nullable=False)
+    filename = Column(String(255), nullable=False)
+    file_path = Column(String(1024), nullable=False)
+    state = Column(Enum(ImportJobState, name="importjobstate"), nullable=False, default=ImportJobState.QUEUED, index=True)
+
+    # Progress is committed together with each chunk of invitations, so after a
+    # crash the job resumes right after `last_row` without duplicating rows.
+    last_row = Column(Integer, nullable=False, default=0)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    created = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    unchanged = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=False, default=list)
+    detail = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
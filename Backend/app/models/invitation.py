@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Text, Enum, DateTime, JSON, Integer, func
+from sqlalchemy import Column, String, Text, Enum, DateTime, ForeignKey, Index, JSON, Integer, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import Base
 import enum
@@ -11,20 +11,52 @@ class InvitationStatus(enum.Enum):
 
 class Invitation(Base):
     __tablename__ = "invitations"
+    __table_args__ = (
+        Index("ix_invitations_created_at_id", "created_at", "id"),
+        Index("ix_invitations_recipient_name_id", "recipient_name", "id"),
+        Index("ix_invitations_updated_at", "updated_at"),
+        Index("ix_invitations_slug_pattern", "slug", postgresql_ops={"slug": "varchar_pattern_ops"}),
+        Index(
+            "uq_invitations_import_key",
+            "import_key",
+            unique=True,
+            postgresql_where=text("import_key IS NOT NULL"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    title = Column(String(255), nullable=False)
-    company_name = Column(String(255), nullable=False)
+    template_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("invitation_templates.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    # The template version this invitation inherits from; it stays put when the
+    # template is edited, unless the edit is propagated.
+    template_version_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("invitation_template_versions.id"),
+        nullable=True,
+    )
+    # title, company_name, content, event_*, google_map_url and schedule are
+    # per-invitation overrides: NULL means "use the template version's value"
+    # (app.core.template_content). Invitations without a template store them all.
+    title = Column(String(255), nullable=True)
+    company_name = Column(String(255), nullable=True)
     recipient_salutation = Column(String(32), nullable=True)
     recipient_name = Column(String(255), nullable=False)
     recipient_title = Column(String(255), nullable=False)
-    content = Column(Text, nullable=False)
-    event_time = Column(DateTime, nullable=False)
-    event_location = Column(String(255), nullable=False)
+    content = Column(Text, nullable=True)
+    event_time = Column(DateTime, nullable=True)
+    event_location = Column(String(255), nullable=True)
     google_map_url = Column(String(512), nullable=True)
-    schedule = Column(JSON, nullable=True)
+    schedule = Column(JSON(none_as_null=True), nullable=True)
     slug = Column(String(255), unique=True, nullable=True)
+    # Hash of (template, salutation, name, title) for imported guests; a
+    # re-upload of the same sheet updates these rows instead of adding copies.
+    import_key = Column(String(64), nullable=True)
     status = Column(Enum(InvitationStatus), nullable=False, default=InvitationStatus.draft)
     rsvp_status = Column(RSVP_STATUS_ENUM, nullable=False, default=RsvpStatus.PENDING)
     attendee_count = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, func
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.models.base import Base
@@ -7,6 +7,11 @@ from app.models.rsvp import RSVP_STATUS_ENUM, RsvpStatus
 
 class InvitationResponse(Base):
     __tablename__ = "invitation_responses"
+    # One response per invitation; the RSVP upsert relies on the first constraint.
+    __table_args__ = (
+        UniqueConstraint("invitation_id", name="uq_invitation_responses_invitation_id"),
+        UniqueConstraint("invitation_id", "responder_id", name="uq_invitation_responses_invitation_responder"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     invitation_id = Column(UUID(as_uuid=True), ForeignKey("invitations.id"), nullable=False)
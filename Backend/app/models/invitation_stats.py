@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.models.base import Base
+
+
+class InvitationStats(Base):
+    """RSVP totals per event (template), maintained alongside every invitation write.
+
+    Invitations without a template are counted under `NO_TEMPLATE`
+    (app.core.invitation_stats), so the primary key never needs to be NULL.
+    """
+
+    __tablename__ = "invitation_stats"
+
+    template_id = Column(UUID(as_uuid=True), primary_key=True)
+    invited = Column(Integer, nullable=False, default=0)
+    pending = Column(Integer, nullable=False, default=0)
+    attending = Column(Integer, nullable=False, default=0)
+    declined = Column(Integer, nullable=False, default=0)
+    headcount = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, JSON, String, Text, func
+from sqlalchemy import Column, DateTime, ForeignKey, JSON, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.models.base import Base
@@ -20,5 +20,41 @@ class InvitationTemplate(Base):
     google_map_url = Column(String(512), nullable=True)
     schedule = Column(JSON, nullable=True)
 
+    # Version holding the values above; new invitations inherit from it.
+    current_version_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("invitation_template_versions.id", use_alter=True, name="fk_invitation_templates_current_version"),
+        nullable=True,
+    )
+
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class InvitationTemplateVersion(Base):
+    """The shared fields of a template as they were at one point; never updated.
+
+    Invitations point at the version they were created from (or were last
+    propagated to), so editing a template only adds a row here.
+    """
+
+    __tablename__ = "invitation_template_versions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Kept when the template is deleted, so its invitations still show it.
+    template_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("invitation_templates.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    company_name = Column(String(255), nullable=False)
+    title = Column(String(255), nullable=False)
+    content = Column(Text, nullable=False)
+
+    event_time = Column(DateTime, nullable=True)
+    event_location = Column(String(255), nullable=True)
+    google_map_url = Column(String(512), nullable=True)
+    schedule = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
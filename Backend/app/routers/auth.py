@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
-from app.core.auth import get_db
+from app.core.auth import Principal, get_current_admin, get_db, revoke_tokens
 from app.models.user import User
 from app.core.security import verify_password, create_access_token
 from app.schemas.token import Token
@@ -13,5 +13,14 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     user = db.query(User).filter(User.username == form_data.username).first()
     if not user or not verify_password(form_data.password, user.hashed_password) or not user.is_admin:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
-    access_token = create_access_token(data={"sub": user.username})
+    access_token = create_access_token(data={"sub": user.username, "ver": user.token_version})
     return {"access_token": access_token, "token_type": "bearer"}
+
+
+@router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+def revoke(principal: Principal = Depends(get_current_admin), db: Session = Depends(get_db)):
+    """Sign the current admin out everywhere by invalidating all of their tokens."""
+    user = db.query(User).filter(User.id == principal.id).first()
+    if user:
+        revoke_tokens(db, user)
+    return None
@@ -1,167 +1,232 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, UploadFile, File, Form
 from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 import uuid
 from uuid import UUID
-from io import BytesIO
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import case, func
-from app.core.auth import get_db, get_current_admin
+from sqlalchemy import func, literal, select, tuple_
+from app.core import (
+    changes,
+    import_jobs,
+    invitation_bulk,
+    invitation_cache,
+    invitation_stats,
+    rsvp,
+    rsvp_buffer,
+    template_content,
+)
+from app.core.auth import get_async_db, get_db, get_current_admin
+from app.core.database import AsyncSessionLocal
+from app.core.cache import etag_matches
+from app.core.responses import ORJSONResponse
+from app.core.invitation_export import (
+    MEDIA_TYPES,
+    cache_and_open,
+    export_etag,
+    iter_csv,
+    iter_export_rows,
+    iter_file,
+    iter_ndjson,
+    open_cached,
+    tee_to_cache,
+    write_xlsx,
+)
+from app.core.invitation_import import IMPORT_EXTENSIONS, import_file, spool_upload
+from app.core.slugs import SlugAllocator, slug_base
+from app.models.import_job import ImportJob
 from app.models.invitation import Invitation, InvitationStatus
 from app.models.invitation_response import InvitationResponse
 from app.models.template import InvitationTemplate
 from app.models.rsvp import RsvpStatus
-from app.schemas.invitation import InvitationAdminListItem, InvitationCreate, InvitationOut
+from app.schemas.invitation import InvitationAdminListItem, InvitationCreate, InvitationOut, InvitationStatsOut
 from app.schemas.invitation_response import InvitationResponseCreate, InvitationResponseOut
-from app.schemas.invitation_import import InvitationImportResult, InvitationImportCreatedItem, InvitationImportErrorItem
-from slugify import slugify
+from app.schemas.invitation_bulk import InvitationBulkResult, InvitationBulkSelection
+from app.schemas.invitation_import import ImportJobOut, InvitationImportResult
 from datetime import datetime
+import base64
+import json
 import os
 
-import openpyxl
-
 router = APIRouter(prefix="/api/invitations", tags=["invitations"])
 
+GUEST_ASYNC_DB = os.getenv("GUEST_ASYNC_DB", "1").lower() not in ("0", "false", "no")
 
-@router.get("/export", dependencies=[Depends(get_current_admin)])
-def export_invitations(request: Request, db: Session = Depends(get_db)):
-    invitations = db.query(Invitation).order_by(Invitation.created_at.desc()).all()
+# Content an invitation must have, either stored or inherited from its template.
+CREATE_REQUIRED_FIELDS = ("title", "company_name", "content", "event_time", "event_location")
 
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Invitations"
+LIST_MAX_LIMIT = 500
+# Item fields `fields=` may pick from; the aggregates are derived, not selected.
+LIST_FIELDS = tuple(InvitationAdminListItem.model_fields)
+LIST_AGGREGATES = ("responses", "attending", "attending_people", "declined")
+LIST_SORT_COLUMNS = {
+    "created_at": Invitation.created_at,
+    "recipient_name": Invitation.recipient_name,
+}
+
+
+@router.get("/export", dependencies=[Depends(get_current_admin)])
+def export_invitations(request: Request, format: str = "xlsx", db: Session = Depends(get_db)):
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid format")
 
     origin = request.headers.get("origin")
     base_url = (os.getenv("PUBLIC_INVITE_BASE_URL") or origin or "").rstrip("/")
 
-    headers = [
-        "recipient_salutation",
-        "recipient_name",
-        "recipient_title",
-        "status",
-        "slug",
-        "invite_url",
-        "rsvp_status",
-        "attendee_count",
-        "created_at",
-    ]
-    ws.append(headers)
-
-    for inv in invitations:
-        slug = inv.slug or ""
-        invite_path = f"/invite/{slug}" if slug else ""
-        invite_url = f"{base_url}{invite_path}" if base_url and slug else invite_path
-
-        ws.append(
-            [
-                inv.recipient_salutation or "",
-                inv.recipient_name,
-                inv.recipient_title,
-                inv.status.value if hasattr(inv.status, "value") else str(inv.status),
-                slug,
-                invite_url,
-                inv.rsvp_status.value if hasattr(inv.rsvp_status, "value") else str(inv.rsvp_status),
-                int(inv.attendee_count or 0),
-                inv.created_at.isoformat() if inv.created_at else "",
-            ]
-        )
+    etag = export_etag(db, format, base_url)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    bio = BytesIO()
-    wb.save(bio)
-    bio.seek(0)
+    filename = f"invitations_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{format}"
+    headers["Content-Disposition"] = f"attachment; filename={filename}"
+    media_type = MEDIA_TYPES[format]
 
-    filename = f"invitations_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    return StreamingResponse(
-        bio,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
+    cached = open_cached(etag)
+    if cached is not None:
+        return StreamingResponse(iter_file(cached), media_type=media_type, headers=headers)
 
+    rows = iter_export_rows(db, base_url)
+    if format == "csv":
+        return StreamingResponse(tee_to_cache(iter_csv(rows), etag), media_type=media_type, headers=headers)
+    if format == "ndjson":
+        return StreamingResponse(tee_to_cache(iter_ndjson(rows), etag), media_type=media_type, headers=headers)
 
-def _generate_unique_slug(db: Session, base_text: str, used: set[str]) -> str:
-    base = slugify(base_text)
-    candidate = base
-    suffix = 2
-    while candidate in used or db.query(Invitation).filter(Invitation.slug == candidate).first():
-        candidate = f"{base}-{suffix}"
-        suffix += 1
-    used.add(candidate)
-    return candidate
-
-
-def _normalize_header(v: object) -> str:
-    if v is None:
-        return ""
-    s = str(v).strip().lower()
-    s = s.replace("\u00a0", " ")
-    s = " ".join(s.split())
-    s = s.replace("-", "_")
-    s = s.replace(" ", "_")
-    return s
-
-
-def _cell_text(v: object) -> str:
-    if v is None:
-        return ""
-    if isinstance(v, datetime):
-        return v.isoformat()
-    return str(v).strip()
-
-
-def _safe_cell_text(row: tuple[object, ...], idx: int | None) -> str:
-    if idx is None:
-        return ""
-    if idx < 0:
-        return ""
-    if idx >= len(row):
-        return ""
-    return _cell_text(row[idx])
-
-
-@router.get("/", dependencies=[Depends(get_current_admin)])
-def list_invitations(db: Session = Depends(get_db)) -> list[InvitationAdminListItem]:
-    rows = (
-        db.query(
-            Invitation,
-            func.count(InvitationResponse.id).label("responses"),
-            func.coalesce(
-                func.sum(case((InvitationResponse.response == RsvpStatus.ATTENDING, 1), else_=0)),
-                0,
-            ).label("attending"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (
-                            InvitationResponse.response == RsvpStatus.ATTENDING,
-                            func.coalesce(InvitationResponse.attendee_count, 1),
-                        ),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("attending_people"),
-            func.coalesce(
-                func.sum(case((InvitationResponse.response == RsvpStatus.DECLINED, 1), else_=0)),
-                0,
-            ).label("declined"),
-        )
-        .outerjoin(InvitationResponse, InvitationResponse.invitation_id == Invitation.id)
-        .group_by(Invitation.id)
-        .order_by(Invitation.created_at.desc())
-        .all()
+    fh = cache_and_open(etag, write_xlsx(rows))
+    return StreamingResponse(iter_file(fh), media_type=media_type, headers=headers)
+
+
+def _encode_cursor(value: object, invitation_id: UUID) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, str(invitation_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_field: str) -> tuple[object, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        decoded = json.loads(raw)
+        # Every cursor we hand out is [sort value, id], both strings.
+        if not (isinstance(decoded, list) and len(decoded) == 2 and all(isinstance(v, str) for v in decoded)):
+            raise ValueError(decoded)
+        value, invitation_id = decoded
+        if sort_field == "created_at":
+            value = datetime.fromisoformat(value)
+        return value, UUID(invitation_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/stats", response_model=InvitationStatsOut, dependencies=[Depends(get_current_admin)])
+def get_invitation_stats(template_id: UUID | None = None, db: Session = Depends(get_db)):
+    """RSVP totals from the maintained summary table, for one event or all of them."""
+    return InvitationStatsOut(template_id=template_id, **invitation_stats.totals(db, template_id))
+
+
+def _list_fields(fields: str | None) -> list[str]:
+    if not fields:
+        return list(LIST_FIELDS)
+    wanted = {f.strip() for f in fields.split(",") if f.strip()}
+    if not wanted or not wanted <= set(LIST_FIELDS):
+        raise HTTPException(status_code=400, detail="Invalid fields")
+    return [f for f in LIST_FIELDS if f in wanted]
+
+
+def _list_item(row, fields: list[str], templates: dict) -> dict:
+    values = template_content.resolve_values(dict(row), templates.get(row.get("template_version_id")))
+    if "rsvp_status" in values:
+        # rsvp_status/attendee_count mirror the single response row, so the
+        # per-invitation aggregates need no join.
+        attending = values["rsvp_status"] == RsvpStatus.ATTENDING
+        values["responses"] = int(values["rsvp_status"] != RsvpStatus.PENDING)
+        values["attending"] = int(attending)
+        values["attending_people"] = values["attendee_count"] if attending else 0
+        values["declined"] = int(values["rsvp_status"] == RsvpStatus.DECLINED)
+    return {f: values[f] for f in fields}
+
+
+@router.get("/", response_model=list[InvitationAdminListItem], dependencies=[Depends(get_current_admin)])
+def list_invitations(
+    limit: int | None = Query(None, ge=1, le=LIST_MAX_LIMIT),
+    cursor: str | None = None,
+    sort: str = "-created_at",
+    status_value: str | None = Query(None, alias="status"),
+    rsvp_status: RsvpStatus | None = None,
+    template_id: UUID | None = None,
+    q: str | None = None,
+    include_total: bool = True,
+    fields: str | None = None,
+    db: Session = Depends(get_db),
+):
+    """Admin list, newest first by default.
+
+    Without `limit` every matching row is returned, as before. With `limit`
+    the page is cut with a keyset on (sort column, id); the next page's cursor
+    is in `X-Next-Cursor` and the unpaged count in `X-Total-Count`.
+
+    `fields` is a comma-separated subset of the item fields, e.g. to leave out
+    `content` and `schedule`; only the columns behind them are selected. Rows
+    go straight from the result to orjson, without a pydantic model per row.
+    """
+    descending = sort.startswith("-")
+    sort_field = sort.lstrip("-")
+    if sort_field not in LIST_SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail="Invalid sort")
+    sort_col = LIST_SORT_COLUMNS[sort_field]
+    out_fields = _list_fields(fields)
+
+    filters = []
+    if status_value:
+        try:
+            filters.append(Invitation.status == InvitationStatus(status_value))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid status")
+    if rsvp_status:
+        filters.append(Invitation.rsvp_status == rsvp_status)
+    if template_id:
+        filters.append(Invitation.template_id == template_id)
+    if q and q.strip():
+        filters.append(Invitation.recipient_name.ilike(f"%{q.strip()}%"))
+
+    columns = {"id", sort_field, *(f for f in out_fields if f not in LIST_AGGREGATES)}
+    if columns & set(template_content.TEMPLATE_FIELDS):
+        columns.add("template_version_id")
+    if set(out_fields) & set(LIST_AGGREGATES):
+        columns.update(("rsvp_status", "attendee_count"))
+    query = select(*(getattr(Invitation, c) for c in sorted(columns))).where(*filters)
+
+    if cursor:
+        after_value, after_id = _decode_cursor(cursor, sort_field)
+        key, after = tuple_(sort_col, Invitation.id), tuple_(literal(after_value), literal(after_id))
+        query = query.where(key < after if descending else key > after)
+
+    if descending:
+        query = query.order_by(sort_col.desc(), Invitation.id.desc())
+    else:
+        query = query.order_by(sort_col.asc(), Invitation.id.asc())
+
+    headers = {}
+    if limit is not None:
+        # One extra row tells us whether there is a next page.
+        rows = db.execute(query.limit(limit + 1)).mappings().all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            headers["X-Next-Cursor"] = _encode_cursor(last[sort_field], last["id"])
+        if include_total:
+            total = db.execute(select(func.count(Invitation.id)).where(*filters)).scalar()
+            headers["X-Total-Count"] = str(total)
+    else:
+        rows = db.execute(query).mappings().all()
+        headers["X-Total-Count"] = str(len(rows))
+
+    templates = (
+        template_content.get_many(db, (row["template_version_id"] for row in rows))
+        if "template_version_id" in columns
+        else {}
     )
-    result: list[InvitationAdminListItem] = []
-    for inv, responses, attending, attending_people, declined in rows:
-        base = InvitationOut.model_validate(inv).model_dump()
-        result.append(
-            InvitationAdminListItem(
-                **base,
-                responses=int(responses),
-                attending=int(attending),
-                attending_people=int(attending_people),
-                declined=int(declined),
-            )
-        )
-    return result
+    return ORJSONResponse([_list_item(row, out_fields, templates) for row in rows], headers=headers)
 
 @router.post("/", response_model=InvitationOut, dependencies=[Depends(get_current_admin)])
 def create_invitation(invitation: InvitationCreate, db: Session = Depends(get_db)):
@@ -180,31 +245,60 @@ def create_invitation(invitation: InvitationCreate, db: Session = Depends(get_db
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid status")
 
+    template = None
+    if payload.get("template_id"):
+        tpl = db.get(InvitationTemplate, payload["template_id"])
+        if tpl is None:
+            raise HTTPException(status_code=404, detail="Template not found")
+        payload["template_version_id"] = template_content.version_id(db, tpl)
+        template = template_content.get(db, payload["template_version_id"])
+        # Only the values that differ from the template are stored on the row.
+        payload = template_content.overrides(payload, template, invitation.model_fields_set)
+
+    for field in CREATE_REQUIRED_FIELDS:
+        if payload.get(field) is None and (template is None or template[field] is None):
+            raise HTTPException(status_code=400, detail=f"Missing {field}")
+
     db_invitation = Invitation(**payload)
 
     # Rule: slug only generated when publishing.
+    base = None
     if db_invitation.status == InvitationStatus.published and not db_invitation.slug:
-        base = slugify(f"{db_invitation.title}-{db_invitation.recipient_name}")
-        candidate = base
-        suffix = 2
-        while db.query(Invitation).filter(Invitation.slug == candidate).first():
-            candidate = f"{base}-{suffix}"
-            suffix += 1
-        db_invitation.slug = candidate
-
-    db.add(db_invitation)
+        title = db_invitation.title if db_invitation.title is not None else template["title"]
+        base = slug_base(title, db_invitation.recipient_name)
+
+    allocator = SlugAllocator(db)
+
+    def assign() -> None:
+        if base is not None:
+            db_invitation.slug = allocator.allocate(base)
+
+    def write() -> None:
+        db.add(db_invitation)
+        db.flush()
+
+    allocator.write(assign, write)
+    invitation_stats.record_created(db, db_invitation.template_id)
     db.commit()
     db.refresh(db_invitation)
-    return db_invitation
+    invitation_cache.invalidate(db_invitation.slug)
+    return template_content.resolve(db_invitation, template)
 
 
-@router.post("/import", response_model=InvitationImportResult, dependencies=[Depends(get_current_admin)])
-async def import_invitations(
+@router.post(
+    "/import",
+    response_model=InvitationImportResult | ImportJobOut,
+    dependencies=[Depends(get_current_admin)],
+)
+def import_invitations(
+    response: Response,
     template_id: UUID = Form(...),
     status_value: str = Form("draft"),
+    background: bool = Form(False),
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
 ):
+    # Plain `def`: parsing and DB writes run in the threadpool, off the event loop.
     # Validate status
     try:
         status_enum = InvitationStatus(status_value)
@@ -219,141 +313,117 @@ async def import_invitations(
         raise HTTPException(status_code=400, detail="Template must have event_time and event_location")
 
     filename = (file.filename or "").lower()
-    if not filename.endswith(".xlsx"):
-        raise HTTPException(status_code=400, detail="Only .xlsx files are supported")
-
-    raw = await file.read()
-    if not raw:
-        raise HTTPException(status_code=400, detail="Empty file")
+    if not filename.endswith(IMPORT_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Only .xlsx, .csv and .ndjson files are supported")
+
+    path = spool_upload(file)
+
+    if background:
+        # The spooled file is owned by the job from here on and removed when it finishes.
+        job = ImportJob(
+            template_id=tpl.id,
+            invitation_status=status_enum.value,
+            filename=file.filename or "",
+            file_path=path,
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        import_jobs.submit(job.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return ImportJobOut.model_validate(job)
 
     try:
-        wb = openpyxl.load_workbook(BytesIO(raw), read_only=True, data_only=True)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid .xlsx file")
+        return import_file(db, path, tpl, status_enum)
+    finally:
+        os.unlink(path)
 
-    ws = wb.active
-    rows_iter = ws.iter_rows(values_only=True)
-    try:
-        header_row = next(rows_iter)
-    except StopIteration:
-        raise HTTPException(status_code=400, detail="Empty sheet")
-
-    headers = [_normalize_header(h) for h in header_row]
-
-    # Allow a few common header variants.
-    aliases = {
-        "recipient_salutation": {
-            "recipient_salutation",
-            "salutation",
-            "xung_ho",
-            "xungho",
-            "ong_ba",
-            "ông_bà",
-            "ong",
-            "ba",
-        },
-        "recipient_name": {
-            "recipient_name",
-            "name",
-            "ten",
-            "ho_ten",
-            "họ_tên",
-            "nguoi_nhan",
-            "người_nhận",
-        },
-        "recipient_title": {
-            "recipient_title",
-            "title",
-            "chuc_danh",
-            "chức_danh",
-            "chuc_vu",
-            "chức_vụ",
-        },
-    }
-
-    index_map: dict[str, int] = {}
-    for i, h in enumerate(headers):
-        for canonical, keys in aliases.items():
-            if h in keys and canonical not in index_map:
-                index_map[canonical] = i
-
-    if "recipient_name" not in index_map or "recipient_title" not in index_map:
-        raise HTTPException(
-            status_code=400,
-            detail="Missing required columns: recipient_name and recipient_title",
-        )
 
-    created_items: list[InvitationImportCreatedItem] = []
-    errors: list[InvitationImportErrorItem] = []
-    used_slugs: set[str] = set()
-    created = 0
-    skipped = 0
-
-    # Excel rows are 1-based; header is row 1, data starts at row 2.
-    excel_row_num = 1
-    for row in rows_iter:
-        excel_row_num += 1
-
-        name = _safe_cell_text(row, index_map.get("recipient_name"))
-        title = _safe_cell_text(row, index_map.get("recipient_title"))
-        salutation = _safe_cell_text(row, index_map.get("recipient_salutation"))
-
-        if not name and not title and not salutation:
-            skipped += 1
-            continue
-
-        if not name:
-            errors.append(InvitationImportErrorItem(row=excel_row_num, message="Missing recipient_name"))
-            continue
-        if not title:
-            errors.append(InvitationImportErrorItem(row=excel_row_num, message="Missing recipient_title"))
-            continue
-
-        inv = Invitation(
-            title=tpl.title,
-            company_name=tpl.company_name,
-            recipient_salutation=salutation.strip() or "Ông",
-            recipient_name=name,
-            recipient_title=title,
-            content=tpl.content,
-            event_time=tpl.event_time,
-            event_location=tpl.event_location,
-            google_map_url=tpl.google_map_url,
-            schedule=tpl.schedule,
-            status=status_enum,
-        )
+@router.get("/import/{job_id}", response_model=ImportJobOut, dependencies=[Depends(get_current_admin)])
+def get_import_job(job_id: UUID, db: Session = Depends(get_db)):
+    job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
 
-        if inv.status == InvitationStatus.published and not inv.slug:
-            inv.slug = _generate_unique_slug(db, f"{inv.title}-{inv.recipient_name}", used_slugs)
+def _bulk_selection(selection: InvitationBulkSelection) -> InvitationBulkSelection:
+    # An empty body must not mean "every invitation".
+    if selection.ids is None and selection.template_id is None and selection.rsvp_status is None:
+        raise HTTPException(status_code=400, detail="Select invitations by ids or filter")
+    return selection
 
-        db.add(inv)
-        db.flush()  # populate id
-        created += 1
-        created_items.append(InvitationImportCreatedItem(row=excel_row_num, id=inv.id, slug=inv.slug))
 
-    db.commit()
+@router.post("/bulk/publish", response_model=InvitationBulkResult, dependencies=[Depends(get_current_admin)])
+def bulk_publish(selection: InvitationBulkSelection, db: Session = Depends(get_db)):
+    return invitation_bulk.publish(db, _bulk_selection(selection))
 
-    return InvitationImportResult(created=created, skipped=skipped, items=created_items, errors=errors)
 
-@router.get("/{slug}", response_model=InvitationOut)
-def get_invitation(slug: str, db: Session = Depends(get_db)):
-    invitation = db.query(Invitation).filter(Invitation.slug == slug, Invitation.status == InvitationStatus.published).first()
-    if not invitation:
-        raise HTTPException(status_code=404, detail="Invitation not found")
-    return invitation
+@router.post("/bulk/unpublish", response_model=InvitationBulkResult, dependencies=[Depends(get_current_admin)])
+def bulk_unpublish(selection: InvitationBulkSelection, db: Session = Depends(get_db)):
+    return invitation_bulk.unpublish(db, _bulk_selection(selection))
 
-@router.post("/{slug}/response", response_model=InvitationResponseOut)
-def respond_invitation(
-    slug: str,
-    payload: InvitationResponseCreate,
-    request: Request,
-    response: Response,
-    db: Session = Depends(get_db),
-):
-    invitation = db.query(Invitation).filter(Invitation.slug == slug, Invitation.status == InvitationStatus.published).first()
-    if not invitation:
+
+@router.post("/bulk/delete", response_model=InvitationBulkResult, dependencies=[Depends(get_current_admin)])
+def bulk_delete(selection: InvitationBulkSelection, db: Session = Depends(get_db)):
+    return invitation_bulk.delete_selected(db, _bulk_selection(selection))
+
+
+def _published(slug: str):
+    return select(Invitation).where(Invitation.slug == slug, Invitation.status == InvitationStatus.published)
+
+
+def _cache_entry(invitation: Invitation, template: dict | None) -> invitation_cache.CachedInvitation:
+    body = InvitationOut.model_validate(template_content.resolve(invitation, template)).model_dump_json().encode()
+    return invitation_cache.make_entry(invitation.id, body)
+
+
+def _load_published(db: Session, slug: str) -> invitation_cache.CachedInvitation | None:
+    invitation = db.execute(_published(slug)).scalar_one_or_none()
+    if invitation is None:
+        return None
+    return _cache_entry(invitation, template_content.get(db, invitation.template_version_id))
+
+
+async def _aload_published(db: AsyncSession, slug: str) -> invitation_cache.CachedInvitation | None:
+    invitation = (await db.execute(_published(slug))).scalar_one_or_none()
+    if invitation is None:
+        return None
+    return _cache_entry(invitation, await template_content.aget(db, invitation.template_version_id))
+
+
+def _cached_response(request: Request, entry: invitation_cache.CachedInvitation | None) -> Response:
+    if entry is None:
         raise HTTPException(status_code=404, detail="Invitation not found")
 
+    headers = {"ETag": entry.etag, "Cache-Control": invitation_cache.INVITATION_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _with_pending_answer(slug: str, entry: invitation_cache.CachedInvitation | None):
+    # Read-your-writes for answers still queued by the RSVP write-behind mode.
+    return rsvp_buffer.overlay(slug, entry) if rsvp_buffer.RSVP_WRITE_BEHIND else entry
+
+
+def get_invitation(slug: str, request: Request, db: Session = Depends(get_db)):
+    def load() -> invitation_cache.CachedInvitation | None:
+        return _load_published(db, slug)
+
+    # Concurrent misses for one slug share a single query.
+    return _cached_response(request, _with_pending_answer(slug, invitation_cache.get(slug, load)))
+
+
+async def get_invitation_async(slug: str, request: Request):
+    async def load() -> invitation_cache.CachedInvitation | None:
+        # Own session: the shared load may outlive the request that started it.
+        async with AsyncSessionLocal() as db:
+            return await _aload_published(db, slug)
+
+    return _cached_response(request, _with_pending_answer(slug, await invitation_cache.aget(slug, load)))
+
+
+def _validated_answer(payload: InvitationResponseCreate) -> tuple[RsvpStatus, int]:
     response_value = payload.response
     if response_value == RsvpStatus.PENDING:
         raise HTTPException(status_code=400, detail="Invalid response")
@@ -366,50 +436,125 @@ def respond_invitation(
             attendee_count = 1
         if attendee_count < 1 or attendee_count > 20:
             raise HTTPException(status_code=400, detail="attendee_count must be between 1 and 20")
+    return response_value, attendee_count
 
-    # 1 invitation has exactly 1 response (last write wins).
-    db_response = (
-        db.query(InvitationResponse)
-        .filter(InvitationResponse.invitation_id == invitation.id)
-        .order_by(InvitationResponse.created_at.desc())
-        .first()
-    )
-
-    if db_response:
-        db_response.response = response_value
-        db_response.attendee_count = attendee_count
-    else:
-        db_response = InvitationResponse(
-            invitation_id=invitation.id,
-            responder_id=invitation.id,
-            response=response_value,
-            attendee_count=attendee_count,
-        )
-        db.add(db_response)
-
-    invitation.rsvp_status = response_value
-    invitation.attendee_count = attendee_count if response_value == RsvpStatus.ATTENDING else 0
-    db.commit()
-    db.refresh(db_response)
 
+def _set_choice_cookie(response: Response, invitation_id: UUID, response_value: RsvpStatus) -> None:
     one_year = 60 * 60 * 24 * 365
     response.set_cookie(
-        f"invite_choice_{invitation.id}",
+        f"invite_choice_{invitation_id}",
         response_value.value,
         httponly=False,
         samesite="lax",
         max_age=one_year,
     )
-    return db_response
+
+
+def _queued_answer(
+    response: Response,
+    entry: invitation_cache.CachedInvitation,
+    item: rsvp_buffer.PendingRsvp,
+) -> InvitationResponseOut:
+    """202 for an answer journaled by the write-behind mode.
+
+    `id` is the response row id only if the invitation had no answer before.
+    """
+    response.status_code = status.HTTP_202_ACCEPTED
+    _set_choice_cookie(response, entry.id, item.response)
+    return InvitationResponseOut(
+        id=item.response_id,
+        invitation_id=entry.id,
+        response=item.response,
+        attendee_count=item.attendee_count,
+        created_at=item.created_at,
+    )
+
+
+def respond_invitation(
+    slug: str,
+    payload: InvitationResponseCreate,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    response_value, attendee_count = _validated_answer(payload)
+    if rsvp_buffer.RSVP_WRITE_BEHIND:
+        entry = invitation_cache.get(slug, lambda: _load_published(db, slug))
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Invitation not found")
+        item = rsvp_buffer.submit(slug, entry.id, response_value, attendee_count)
+        return _queued_answer(response, entry, item)
+
+    # Single statement: concurrent taps from one guest serialize on the
+    # invitation row and converge on one response row.
+    row = db.execute(rsvp.upsert_statement(slug, response_value, attendee_count)).mappings().first()
+    if not row:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Invitation not found")
+    changes.mark(db)
+    db.commit()
+    invitation_cache.invalidate(slug)
+
+    _set_choice_cookie(response, row["invitation_id"], response_value)
+    return InvitationResponseOut.model_validate(dict(row))
+
+
+async def respond_invitation_async(
+    slug: str,
+    payload: InvitationResponseCreate,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    response_value, attendee_count = _validated_answer(payload)
+    if rsvp_buffer.RSVP_WRITE_BEHIND:
+
+        async def load() -> invitation_cache.CachedInvitation | None:
+            async with AsyncSessionLocal() as load_db:
+                return await _aload_published(load_db, slug)
+
+        entry = await invitation_cache.aget(slug, load)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Invitation not found")
+        # The journal fsync blocks, so keep it off the event loop.
+        item = await run_in_threadpool(rsvp_buffer.submit, slug, entry.id, response_value, attendee_count)
+        return _queued_answer(response, entry, item)
+
+    row = (await db.execute(rsvp.upsert_statement(slug, response_value, attendee_count))).mappings().first()
+    if not row:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Invitation not found")
+    changes.mark(db.sync_session)
+    await db.commit()
+    invitation_cache.invalidate(slug)
+
+    _set_choice_cookie(response, row["invitation_id"], response_value)
+    return InvitationResponseOut.model_validate(dict(row))
+
+
+# Guest endpoints run on the event loop by default, so a traffic spike is not
+# capped by the threadpool size. GUEST_ASYNC_DB=0 serves them from the sync
+# stack instead (benchmarks/guest_sync_vs_async.py compares the two).
+if GUEST_ASYNC_DB:
+    router.add_api_route("/{slug}", get_invitation_async, methods=["GET"], response_model=InvitationOut)
+    router.add_api_route(
+        "/{slug}/response", respond_invitation_async, methods=["POST"], response_model=InvitationResponseOut
+    )
+else:
+    router.add_api_route("/{slug}", get_invitation, methods=["GET"], response_model=InvitationOut)
+    router.add_api_route("/{slug}/response", respond_invitation, methods=["POST"], response_model=InvitationResponseOut)
 
 
 @router.delete("/{invitation_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(get_current_admin)])
 def delete_invitation(invitation_id: UUID, db: Session = Depends(get_db)):
-    invitation = db.query(Invitation).filter(Invitation.id == invitation_id).first()
+    invitation = db.query(Invitation).filter(Invitation.id == invitation_id).with_for_update().first()
     if not invitation:
         raise HTTPException(status_code=404, detail="Invitation not found")
 
+    slug = invitation.slug
+    invitation_stats.record_deleted(db, invitation.template_id, invitation.rsvp_status, invitation.attendee_count)
     db.query(InvitationResponse).filter(InvitationResponse.invitation_id == invitation_id).delete(synchronize_session=False)
     db.delete(invitation)
     db.commit()
+    invitation_cache.invalidate(slug)
     return None
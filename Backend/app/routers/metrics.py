@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.core import request_metrics
+from app.core.auth import get_current_admin
+from app.core.database import async_engine, engine
+from app.core.db_pool import pool_status
+
+# Bearer token for the Prometheus endpoint; when unset the endpoint is not served.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+exposition_router = APIRouter(tags=["metrics"])
+
+
+def _pools() -> dict[str, dict]:
+    return {
+        "sync": pool_status(engine.pool),
+        "async": pool_status(async_engine.pool),
+    }
+
+
+@router.get("/pool", dependencies=[Depends(get_current_admin)])
+def get_pool_metrics() -> dict:
+    """Connection pool occupancy and checkout wait times, per engine.
+
+    A growing `waits` count or a heavy tail in `wait_histogram` means requests
+    are queueing for a connection rather than for Postgres.
+    """
+    return _pools()
+
+
+@exposition_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics(request: Request):
+    """Per-route request/DB metrics and pool metrics in Prometheus text format."""
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    auth = request.headers.get("authorization", "")
+    if not hmac.compare_digest(auth, f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
+    return PlainTextResponse(
+        request_metrics.render_prometheus(_pools()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
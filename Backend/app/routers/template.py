@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
+from app.core import invitation_cache, invitation_stats, template_content
 from app.core.auth import get_current_admin, get_db
 from app.models.template import InvitationTemplate
 from app.schemas.template import (
@@ -28,6 +29,8 @@ def create_template(payload: InvitationTemplateCreate, db: Session = Depends(get
 
     t = InvitationTemplate(**payload.model_dump())
     db.add(t)
+    db.flush()
+    template_content.new_version(db, t)
     db.commit()
     db.refresh(t)
     return t
@@ -42,7 +45,23 @@ def get_template(template_id: str, db: Session = Depends(get_db)):
 
 
 @router.put("/{template_id}", response_model=InvitationTemplateOut, dependencies=[Depends(get_current_admin)])
-def update_template(template_id: str, payload: InvitationTemplateUpdate, db: Session = Depends(get_db)):
+def update_template(
+    template_id: str,
+    payload: InvitationTemplateUpdate,
+    response: Response,
+    propagate: bool = False,
+    db: Session = Depends(get_db),
+):
+    """Update a template.
+
+    A change to the shared fields adds a template version. By default
+    invitations already created from it stay on their version and keep
+    showing the old values. With `propagate=true` every linked invitation
+    moves to the current version and follows it wherever it was not
+    customised, including invitations left behind by earlier edits when
+    this one changes nothing; the number of invitations whose content
+    changed is returned in `X-Propagated-Count`.
+    """
     t = db.query(InvitationTemplate).filter(InvitationTemplate.id == template_id).first()
     if not t:
         raise HTTPException(status_code=404, detail="Template not found")
@@ -53,12 +72,20 @@ def update_template(template_id: str, payload: InvitationTemplateUpdate, db: Ses
         if exists:
             raise HTTPException(status_code=400, detail="Template name already exists")
 
+    changed = [k for k in template_content.TEMPLATE_FIELDS if k in data and data[k] != getattr(t, k)]
+
     for k, v in data.items():
         setattr(t, k, v)
+    if changed:
+        template_content.new_version(db, t)
 
     db.add(t)
     db.commit()
     db.refresh(t)
+    if propagate:
+        count = template_content.propagate(db, t.id, t.current_version_id)
+        invitation_cache.clear()
+        response.headers["X-Propagated-Count"] = str(count)
     return t
 
 
@@ -67,6 +94,9 @@ def delete_template(template_id: str, db: Session = Depends(get_db)):
     t = db.query(InvitationTemplate).filter(InvitationTemplate.id == template_id).first()
     if not t:
         raise HTTPException(status_code=404, detail="Template not found")
+    # Linked invitations lose template_id (ON DELETE SET NULL) but keep their
+    # template version, which outlives the template.
+    invitation_stats.detach_template(db, t.id)
     db.delete(t)
     db.commit()
     return {"ok": True}
@@ -22,13 +22,22 @@ class InvitationBase(BaseModel):
     schedule: Optional[List[ScheduleItem]] = None
 
 class InvitationCreate(InvitationBase):
+    # With a template, omitted shared fields are taken from it.
+    title: Optional[str] = None
+    company_name: Optional[str] = None
+    content: Optional[str] = None
+    event_time: Optional[datetime] = None
+    event_location: Optional[str] = None
+
     status: str | None = None
+    template_id: UUID | None = None
 
 class InvitationUpdate(InvitationBase):
     status: Optional[str] = None
 
 class InvitationOut(InvitationBase):
     id: UUID
+    template_id: Optional[UUID] = None
     slug: Optional[str]
     status: str
     rsvp_status: RsvpStatus
@@ -43,3 +52,12 @@ class InvitationAdminListItem(InvitationOut):
     attending: int = 0
     attending_people: int = 0
     declined: int = 0
+
+
+class InvitationStatsOut(BaseModel):
+    template_id: Optional[UUID] = None
+    invited: int = 0
+    pending: int = 0
+    attending: int = 0
+    declined: int = 0
+    headcount: int = 0
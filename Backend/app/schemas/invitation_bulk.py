@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.models.rsvp import RsvpStatus
+
+
+class InvitationBulkSelection(BaseModel):
+    """Invitations to act on: explicit ids, a filter, or both (intersected)."""
+
+    ids: list[UUID] | None = None
+    template_id: UUID | None = None
+    rsvp_status: RsvpStatus | None = None
+
+
+class InvitationBulkItem(BaseModel):
+    id: UUID
+    slug: str | None = None
+
+
+class InvitationBulkResult(BaseModel):
+    affected: int
+    items: list[InvitationBulkItem] = []
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+from app.models.import_job import ImportJobState
 
 
 class InvitationImportCreatedItem(BaseModel):
     row: int
     id: UUID
     slug: str | None = None
+    # "created", or "updated" for a guest matched from an earlier upload.
+    action: str = "created"
 
 
 class InvitationImportErrorItem(BaseModel):
@@ -18,6 +23,27 @@ class InvitationImportErrorItem(BaseModel):
 
 class InvitationImportResult(BaseModel):
     created: int
+    updated: int = 0
+    unchanged: int = 0
     skipped: int
     items: list[InvitationImportCreatedItem]
     errors: list[InvitationImportErrorItem]
+
+
+class ImportJobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    template_id: UUID
+    filename: str
+    state: ImportJobState
+    rows_processed: int
+    created: int
+    updated: int
+    unchanged: int
+    skipped: int
+    error_count: int
+    errors: list[InvitationImportErrorItem]
+    detail: str | None = None
+    created_at: datetime
+    updated_at: datetime
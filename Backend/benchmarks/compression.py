@@ -0,0 +1,109 @@
+"""Bytes saved and CPU spent by response compression, per endpoint.
+
+Drives the in-process app through httpx with Accept-Encoding set to identity,
+gzip and br (if `brotli` is importable), and reports for each
+endpoint the bytes on the wire, the share saved against identity, and the
+process CPU time per request; the difference to identity is the cost of
+compressing. Run from Backend/ against a database that may be wiped:
+
+    python -m benchmarks.compression --reset --invitations 5000 --iterations 10
+
+COMPRESSION_MIN_SIZE, COMPRESSION_GZIP_LEVEL and COMPRESSION_BROTLI_QUALITY
+apply as usual.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+import httpx
+
+from benchmarks.seed import prepare_database, seed
+from benchmarks.suite import LIST_GRID_FIELDS
+
+from app.core import invitation_cache, invitation_export
+from app.core.compression import ENCODERS
+from app.main import app
+
+ENCODINGS = ("identity", *sorted(ENCODERS))
+
+
+def _endpoints(slug: str) -> dict[str, tuple[str, dict]]:
+    return {
+        "list_full": ("/api/invitations/", {}),
+        "list_grid": ("/api/invitations/", {"fields": LIST_GRID_FIELDS}),
+        "list_page": ("/api/invitations/", {"limit": 50}),
+        "export_csv": ("/api/invitations/export", {"format": "csv"}),
+        "export_ndjson": ("/api/invitations/export", {"format": "ndjson"}),
+        "export_xlsx": ("/api/invitations/export", {"format": "xlsx"}),
+        "guest_page": (f"/api/invitations/{slug}", {}),
+    }
+
+
+async def _measure(client: httpx.AsyncClient, path: str, params: dict, headers: dict, iterations: int) -> dict:
+    sizes, cpu = [], []
+    for _ in range(iterations):
+        # Measure generation each time, not the export or invitation cache.
+        invitation_export._cache.clear()
+        invitation_cache.clear()
+        start = time.process_time()
+        async with client.stream("GET", path, params=params, headers=headers) as r:
+            size = 0
+            async for chunk in r.aiter_raw():
+                size += len(chunk)
+            r.raise_for_status()
+        cpu.append(time.process_time() - start)
+        sizes.append(size)
+    return {
+        "bytes": sizes[-1],
+        "content_encoding": r.headers.get("content-encoding"),
+        "cpu_ms": round(statistics.median(cpu) * 1000, 2),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    prepare_database(args.reset)
+    seeded = seed(args.invitations)
+    admin = {"Authorization": f"Bearer {seeded.admin_token}"}
+
+    results: dict[str, dict] = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for name, (path, params) in _endpoints(seeded.published_slugs[0]).items():
+                print(f"running {name}...", file=sys.stderr)
+                row = results[name] = {}
+                for encoding in ENCODINGS:
+                    headers = {**admin, "Accept-Encoding": encoding}
+                    row[encoding] = await _measure(client, path, params, headers, args.iterations)
+                base = row["identity"]
+                for encoding in ENCODINGS[1:]:
+                    m = row[encoding]
+                    m["saved_pct"] = round(100 * (1 - m["bytes"] / base["bytes"]), 1) if base["bytes"] else 0.0
+                    m["cpu_overhead_ms"] = round(m["cpu_ms"] - base["cpu_ms"], 2)
+
+    return {"meta": {"invitations": args.invitations, "iterations": args.iterations}, "endpoints": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reset", action="store_true", help="empty every table before seeding")
+    parser.add_argument("--invitations", type=int, default=5000, help="invitations to seed")
+    parser.add_argument("--iterations", type=int, default=10, help="requests per endpoint and encoding")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    text = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Fail if a hot query plans a sequential scan over invitations or responses.
+
+Runs EXPLAIN (no ANALYZE, nothing is executed) on the statements behind the
+public slug read, the RSVP upsert, the admin list and its keyset pages, the
+slug allocator, the invitation delete and the export ETag. Exits 1 and prints
+the offending plan if any of them scans a large table sequentially.
+
+Plans depend on table size, so run it against seeded data:
+
+    python -m benchmarks.explain_hot_queries --reset --invitations 20000
+
+or, without --reset, against a database that already holds enough rows.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from sqlalchemy import delete, func, literal, or_, select, tuple_
+from sqlalchemy.dialects import postgresql
+
+from benchmarks.seed import prepare_database, seed
+
+from app.core import rsvp
+from app.core.database import engine
+from app.models.invitation import Invitation, InvitationStatus
+from app.models.invitation_response import InvitationResponse
+from app.models.rsvp import RsvpStatus
+
+WATCHED_TABLES = {"invitations", "invitation_responses"}
+MIN_ROWS = 5000
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in WATCHED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found += _seq_scans(child)
+    return found
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def hot_queries(conn) -> dict[str, str]:
+    slug, template_id = conn.execute(
+        select(Invitation.slug, Invitation.template_id)
+        .where(Invitation.status == InvitationStatus.published)
+        .order_by(Invitation.created_at)
+        .limit(1)
+    ).one()
+    middle = conn.execute(
+        select(Invitation.created_at, Invitation.id, Invitation.recipient_name)
+        .order_by(Invitation.created_at, Invitation.id)
+        .offset(conn.execute(select(func.count(Invitation.id))).scalar() // 2)
+        .limit(1)
+    ).one()
+    invitation_id = conn.execute(select(InvitationResponse.invitation_id).limit(1)).scalar() or middle.id
+    page = select(Invitation)
+
+    return {
+        "get_invitation": _sql(
+            select(Invitation).where(Invitation.slug == slug, Invitation.status == InvitationStatus.published)
+        ),
+        "rsvp_upsert": _sql(rsvp.upsert_statement(slug, RsvpStatus.ATTENDING, 2)),
+        "list_first_page": _sql(page.order_by(Invitation.created_at.desc(), Invitation.id.desc()).limit(51)),
+        "list_keyset_page": _sql(
+            page.where(tuple_(Invitation.created_at, Invitation.id) < tuple_(literal(middle.created_at), literal(middle.id)))
+            .order_by(Invitation.created_at.desc(), Invitation.id.desc())
+            .limit(51)
+        ),
+        "list_by_name": _sql(
+            page.where(tuple_(Invitation.recipient_name, Invitation.id) > tuple_(literal(middle.recipient_name), literal(middle.id)))
+            .order_by(Invitation.recipient_name, Invitation.id)
+            .limit(51)
+        ),
+        "list_by_template": _sql(
+            page.where(Invitation.template_id == template_id)
+            .order_by(Invitation.created_at.desc(), Invitation.id.desc())
+            .limit(51)
+        ),
+        # A name that is already taken: the allocator looks for it and its "-N" variants.
+        "slug_allocator_prefetch": _sql(
+            select(Invitation.slug).where(or_(Invitation.slug == slug, Invitation.slug.like(f"{slug}-%")))
+        ),
+        "response_by_invitation": _sql(select(InvitationResponse).where(InvitationResponse.invitation_id == invitation_id)),
+        "delete_responses": _sql(delete(InvitationResponse).where(InvitationResponse.invitation_id == invitation_id)),
+        # count(*) in the same ETag query is a full pass by nature; only max() is checked.
+        "export_etag_max_updated_at": _sql(select(func.max(Invitation.updated_at))),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reset", action="store_true", help="empty every table and seed fresh data")
+    parser.add_argument("--invitations", type=int, default=20000, help="invitations to seed with --reset")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    if args.reset:
+        prepare_database(reset=True)
+        seed(args.invitations)
+
+    failures = 0
+    with engine.connect() as conn:
+        rows = conn.execute(select(func.count(Invitation.id))).scalar()
+        if rows < MIN_ROWS:
+            sys.exit(f"Only {rows} invitations; plans on small tables are not meaningful. Use --reset.")
+        for name, sql in hot_queries(conn).items():
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}".replace("%", "%%")).scalar()[0]["Plan"]
+            scans = _seq_scans(plan)
+            print(f"{'FAIL' if scans else 'ok  '} {name}" + (f": seq scan on {', '.join(scans)}" if scans else ""))
+            if scans or args.verbose:
+                print(json.dumps(plan, indent=2, default=str))
+            failures += bool(scans)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
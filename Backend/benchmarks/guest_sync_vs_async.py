@@ -0,0 +1,173 @@
+"""Compare the sync and async stacks behind the public guest endpoints.
+
+Starts the app twice under uvicorn, once with GUEST_ASYNC_DB=0 and once with
+GUEST_ASYNC_DB=1, and drives GET /api/invitations/{slug} plus a share of RSVP
+POSTs at a fixed concurrency. Prints requests/s and latency percentiles.
+
+Run from Backend/ against a scratch database (it seeds published invitations
+whose slugs start with "bench-guest-" and leaves them in place):
+
+    python -m benchmarks.guest_sync_vs_async --concurrency 200 --duration 15
+
+The invitation cache is disabled by default so every read reaches the
+database; pass --cache to measure the cached path instead.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime
+
+import httpx
+from sqlalchemy import insert
+
+from app.core import invitation_stats
+from benchmarks.common import percentiles
+from app.core.database import SessionLocal
+from app.models.invitation import Invitation, InvitationStatus
+
+SLUG_PREFIX = "bench-guest-"
+
+
+def seed(count: int) -> list[str]:
+    db = SessionLocal()
+    try:
+        slugs = [slug for (slug,) in db.query(Invitation.slug).filter(Invitation.slug.like(f"{SLUG_PREFIX}%")).limit(count)]
+        missing = count - len(slugs)
+        if missing > 0:
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "title": "Benchmark",
+                    "company_name": "Benchmark",
+                    "recipient_salutation": "Ông",
+                    "recipient_name": f"Guest {i}",
+                    "recipient_title": "Guest",
+                    "content": "Benchmark invitation " * 20,
+                    "event_time": datetime(2030, 1, 1, 18, 0),
+                    "event_location": "Benchmark",
+                    "schedule": [{"time": "18:00", "label": "Check-in"}],
+                    "slug": f"{SLUG_PREFIX}{uuid.uuid4().hex[:12]}",
+                    "status": InvitationStatus.published,
+                }
+                for i in range(missing)
+            ]
+            db.execute(insert(Invitation), rows)
+            invitation_stats.record_created(db, None, missing)
+            db.commit()
+            slugs += [r["slug"] for r in rows]
+        return slugs
+    finally:
+        db.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(f"{base_url}/docs")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def _drive(base_url: str, slugs: list[str], concurrency: int, duration: float, write_ratio: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            rnd = random.Random()
+            while time.monotonic() < deadline:
+                slug = rnd.choice(slugs)
+                start = time.perf_counter()
+                try:
+                    if rnd.random() < write_ratio:
+                        answer = rnd.choice([{"response": "ATTENDING", "attendee_count": rnd.randint(1, 4)}, {"response": "DECLINED"}])
+                        r = await client.post(f"/api/invitations/{slug}/response", json=answer)
+                    else:
+                        r = await client.get(f"/api/invitations/{slug}")
+                    ok = r.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append(time.perf_counter() - start)
+                errors += not ok
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        **percentiles(latencies),
+    }
+
+
+def run_mode(async_db: bool, slugs: list[str], args: argparse.Namespace) -> dict:
+    port = _free_port()
+    env = {**os.environ, "GUEST_ASYNC_DB": "1" if async_db else "0"}
+    if not args.cache:
+        env["INVITATION_CACHE_SIZE"] = "0"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(_wait_ready(base_url))
+        result = asyncio.run(_drive(base_url, slugs, args.concurrency, args.duration, args.write_ratio))
+    finally:
+        server.send_signal(signal.SIGINT)
+        server.wait(timeout=30)
+    return {"mode": "async" if async_db else "sync", **result}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--invitations", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per mode")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="share of requests that are RSVP POSTs")
+    parser.add_argument("--cache", action="store_true", help="keep the invitation cache enabled")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    slugs = seed(args.invitations)
+    results = [run_mode(False, slugs, args), run_mode(True, slugs, args)]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<6} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        print(
+            f"{r['mode']:<6} {r['requests']:>9} {r['errors']:>7} {r['rps']:>8} "
+            f"{r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Fail if the SQL import_key backfill disagrees with the importer's `import_key`.
+
+Evaluates the key expression of the import_key migration (b8f2c4e7a931)
+over sample guest rows (NULL and blank salutations, tabs, newlines,
+non-breaking spaces, decomposed accents, upper case) and compares it with
+what the importer computes when the same guest is uploaded again. Reads no
+tables, so any database the app can reach will do:
+
+    python -m benchmarks.import_key_sql
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import sys
+import unicodedata
+import uuid
+from pathlib import Path
+
+from sqlalchemy import bindparam, text
+
+from app.core.database import engine
+from app.core.invitation_import import import_key
+
+MIGRATION = "b8f2c4e7a931_add_invitation_import_key"
+VERSIONS_DIR = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+
+# (salutation, name, title) as stored on an invitation.
+SAMPLES = [
+    ("Ông", "Nguyễn Văn A", "Giám đốc"),
+    (None, "Nguyễn Văn A", "Giám đốc"),
+    ("", "Trần Thị B", "Kế toán"),
+    ("  \t", "Trần Thị B", "Kế toán"),
+    ("Bà", "\tLê  Thị\nC\r\n", " Trưởng\tphòng "),
+    ("BÀ", "LÊ THỊ C", "TRƯỞNG PHÒNG"),
+    ("Ông", "Phạm\u00a0Văn\u3000D", " Kỹ sư\u2003"),
+    ("Ông", unicodedata.normalize("NFD", "Nguyễn Văn E"), "Giám đốc"),
+    ("Anh", "", ""),
+    ("Chị", "Hoàng F", None),
+]
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(name, VERSIONS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _expected(template_id: uuid.UUID, salutation: str | None, name: str | None, title: str | None) -> str:
+    # What import_file computes for the guest: stripped cells, blank salutation defaulted.
+    return import_key(template_id, (salutation or "").strip() or "Ông", (name or "").strip(), (title or "").strip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    template_id = uuid.uuid4()
+    values = ", ".join(
+        f"(CAST(:s{i} AS varchar), CAST(:n{i} AS varchar), CAST(:t{i} AS varchar))" for i in range(len(SAMPLES))
+    )
+    params = {}
+    for i, (salutation, name, title) in enumerate(SAMPLES):
+        params.update({f"s{i}": salutation, f"n{i}": name, f"t{i}": title})
+
+    key = _load(MIGRATION)._import_key("CAST(:template_id AS uuid)", "s", "n", "t")
+    stmt = text(f"SELECT {key} FROM (VALUES {values}) AS v(s, n, t)").bindparams(
+        bindparam("template_id", str(template_id))
+    )
+    with engine.connect() as conn:
+        keys = conn.execute(stmt, params).scalars().all()
+    wrong = [sample for sample, got in zip(SAMPLES, keys) if got != _expected(template_id, *sample)]
+    print(f"{MIGRATION}: {len(SAMPLES) - len(wrong)}/{len(SAMPLES)} match")
+
+    for sample in wrong:
+        print(f"FAIL {sample!r}")
+    sys.exit(1 if wrong else 0)
+
+
+if __name__ == "__main__":
+    main()
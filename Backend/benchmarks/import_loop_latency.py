@@ -0,0 +1,134 @@
+"""Fail if a large spreadsheet import stalls the event loop.
+
+Uploads a generated workbook (50k rows by default) through the in-process app
+while two probes run on the same event loop: one keeps requesting a public
+invitation page, the other measures how late `asyncio.sleep` wakes up. The
+import itself must run off the loop (threadpool, parse pool), so both stay
+bounded; an import that parses or writes on the loop shows up as one request
+or wake-up stuck for the whole import. Exits 1 if the guest page p99 or the
+worst wake-up delay goes over its limit.
+
+Run from Backend/ against a database that may be wiped:
+
+    python -m benchmarks.import_loop_latency --reset --rows 50000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import sys
+import time
+
+import httpx
+import openpyxl
+
+from benchmarks.common import percentiles
+from benchmarks.seed import prepare_database, seed
+
+from app.main import app
+
+LAG_INTERVAL = 0.01
+PAGE_INTERVAL = 0.02
+
+
+def make_workbook(rows: int) -> bytes:
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Xưng hô", "Họ tên", "Chức danh"])
+    for i in range(rows):
+        ws.append(["Ông" if i % 2 else "Bà", f"Loop guest {i}", f"Title {i % 37}"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+async def _probe_page(client: httpx.AsyncClient, path: str, stop: asyncio.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        r = await client.get(path)
+        r.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        # Paced, so the probe measures the loop instead of competing with the import for CPU.
+        await asyncio.sleep(PAGE_INTERVAL)
+
+
+async def _probe_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(time.perf_counter() - start - LAG_INTERVAL)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    prepare_database(args.reset)
+    seeded = seed(args.invitations)
+    admin = {"Authorization": f"Bearer {seeded.admin_token}"}
+    body = make_workbook(args.rows)
+
+    latencies: list[float] = []
+    lags: list[float] = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            stop = asyncio.Event()
+            probes = [
+                asyncio.ensure_future(_probe_page(client, f"/api/invitations/{seeded.published_slugs[0]}", stop, latencies)),
+                asyncio.ensure_future(_probe_lag(stop, lags)),
+            ]
+            print(f"importing {args.rows} rows...", file=sys.stderr)
+            start = time.perf_counter()
+            try:
+                r = await client.post(
+                    "/api/invitations/import",
+                    data={"template_id": str(seeded.template_id)},
+                    files={"file": ("loop.xlsx", body)},
+                    headers=admin,
+                )
+            finally:
+                elapsed = time.perf_counter() - start
+                stop.set()
+                await asyncio.gather(*probes)
+            r.raise_for_status()
+            result = r.json()
+
+    return {
+        "import": {
+            "rows": args.rows,
+            "seconds": round(elapsed, 2),
+            "created": result["created"],
+            "updated": result["updated"],
+            "unchanged": result["unchanged"],
+        },
+        "guest_page": {"requests": len(latencies), **percentiles(latencies)},
+        "max_loop_lag_ms": round(max(lags, default=0.0) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reset", action="store_true", help="empty every table before seeding")
+    parser.add_argument("--invitations", type=int, default=100, help="invitations to seed")
+    parser.add_argument("--rows", type=int, default=50000, help="rows in the uploaded workbook")
+    parser.add_argument("--max-p99-ms", type=float, default=250, help="fail above this guest page p99")
+    parser.add_argument("--max-lag-ms", type=float, default=500, help="fail above this event-loop wake-up delay")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+
+    failures = []
+    if not report["guest_page"]["requests"]:
+        failures.append("no guest page request completed during the import")
+    elif report["guest_page"]["p99_ms"] > args.max_p99_ms:
+        failures.append(f"guest page p99 {report['guest_page']['p99_ms']} ms > {args.max_p99_ms} ms")
+    if report["max_loop_lag_ms"] > args.max_lag_ms:
+        failures.append(f"event loop lag {report['max_loop_lag_ms']} ms > {args.max_lag_ms} ms")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
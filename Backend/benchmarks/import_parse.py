@@ -0,0 +1,122 @@
+"""Workbook parse throughput of the import reader per IMPORT_PARSE_WORKERS.
+
+Writes a one-sheet workbook and times how long `iter_import_rows` takes to
+hand every row to a consumer that only hashes it, once per worker count,
+each in a fresh interpreter so the pool is sized by the environment as in
+production. `first_s` includes starting the pool; `warm_s` is the best of
+the later runs. Parsing only, no database writes:
+
+    python -m benchmarks.import_parse --rows 100000 --workers 0 2 4
+
+The sheet is split into IMPORT_PARSE_RANGE_ROWS ranges (--range-rows), so
+speedup is bounded by the core count. A worker count of 0 or 1 parses
+in-process. Exits 1 if any worker count yields different rows than the first.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import openpyxl
+
+
+def write_workbook(path: str, rows: int) -> None:
+    # A regular (not write-only) workbook stores the sheet dimension the way
+    # Excel does; the reader sizes its row ranges from it.
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Xưng hô", "Họ tên", "Chức danh"])
+    for i in range(rows):
+        # Every 97th row is left out and every 89th has no title, so gaps and
+        # row errors land on range boundaries too.
+        if i % 97 == 96:
+            continue
+        ws.cell(row=i + 2, column=1, value="Ông" if i % 2 else "Bà")
+        ws.cell(row=i + 2, column=2, value=f"Guest {i}")
+        if i % 89:
+            ws.cell(row=i + 2, column=3, value=f"Title {i % 37}")
+    wb.save(path)
+
+
+def child(path: str, repeat: int) -> None:
+    from app.core.invitation_import import IMPORT_PARSE_WORKERS, iter_import_rows
+
+    times = []
+    for _ in range(repeat):
+        digest = hashlib.sha256()
+        rows = 0
+        start = time.perf_counter()
+        for item in iter_import_rows(path):
+            digest.update(repr(item).encode())
+            rows += 1
+        times.append(time.perf_counter() - start)
+    print(json.dumps({
+        "workers": IMPORT_PARSE_WORKERS,
+        "rows": rows,
+        "digest": digest.hexdigest()[:16],
+        "first_s": round(times[0], 3),
+        "warm_s": round(min(times[1:] or times), 3),
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000, help="data rows in the generated sheet")
+    parser.add_argument("--range-rows", type=int, default=10000, help="IMPORT_PARSE_RANGE_ROWS for the run")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 4], help="IMPORT_PARSE_WORKERS values to run")
+    parser.add_argument("--repeat", type=int, default=3, help="parses per worker count")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.repeat)
+        return
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        print(f"writing {args.rows} rows...", file=sys.stderr)
+        write_workbook(path, args.rows)
+        runs = []
+        for workers in args.workers:
+            print(f"running IMPORT_PARSE_WORKERS={workers}...", file=sys.stderr)
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.import_parse", "--child", path, "--repeat", str(args.repeat)],
+                env={
+                    **os.environ,
+                    "IMPORT_PARSE_WORKERS": str(workers),
+                    "IMPORT_PARSE_RANGE_ROWS": str(args.range_rows),
+                },
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    finally:
+        os.unlink(path)
+
+    baseline = runs[0]["warm_s"]
+    for run in runs:
+        run["rows_per_s"] = round(run["rows"] / run["warm_s"]) if run["warm_s"] else 0
+        run["speedup"] = round(baseline / run["warm_s"], 2) if run["warm_s"] else 0.0
+
+    text = json.dumps({"meta": {"rows": args.rows, "range_rows": args.range_rows, "cpus": os.cpu_count()}, "runs": runs}, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    if len({run["digest"] for run in runs}) > 1:
+        print("FAIL: worker counts disagree on the parsed rows", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
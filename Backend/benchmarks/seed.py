@@ -0,0 +1,128 @@
+"""Create the schema and seed a scratch database with benchmark data."""
+from __future__ import annotations
+
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import func, insert, text
+
+from app.core import invitation_stats, template_content
+from app.core.database import SessionLocal
+from app.core.security import create_access_token
+from app.models.invitation import Invitation, InvitationStatus
+from app.models.invitation_response import InvitationResponse
+from app.models.rsvp import RsvpStatus
+from app.models.template import InvitationTemplate
+from app.models.user import User
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_CHUNK = 5000
+BENCH_ADMIN = "bench-admin"
+
+_TABLES = "invitation_responses, invitations, invitation_stats, import_jobs, invitation_template_versions, invitation_templates, users"
+
+
+class Seeded(NamedTuple):
+    template_id: uuid.UUID
+    admin_token: str
+    published_slugs: list[str]
+
+
+def prepare_database(reset: bool) -> None:
+    """Migrate to head; with `reset`, empty every table first."""
+    cfg = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    command.upgrade(cfg, "head")
+
+    db = SessionLocal()
+    try:
+        if reset:
+            db.execute(text(f"TRUNCATE {_TABLES} CASCADE"))
+            db.commit()
+        elif db.query(func.count(Invitation.id)).scalar():
+            raise SystemExit("The database already has invitations; point DATABASE_URL at a scratch database or pass --reset.")
+    finally:
+        db.close()
+
+
+def seed(invitations: int, published_share: float = 0.8, responded_share: float = 0.3, rnd_seed: int = 1) -> Seeded:
+    """Insert an admin, one template and `invitations` rows with a realistic RSVP mix."""
+    rnd = random.Random(rnd_seed)
+    db = SessionLocal()
+    try:
+        admin = User(username=BENCH_ADMIN, hashed_password="!", is_admin=True)
+        tpl = InvitationTemplate(
+            name="Benchmark",
+            company_name="Benchmark Co.",
+            title="Year End Party",
+            content="Trân trọng kính mời quý khách tham dự buổi tiệc tất niên. " * 10,
+            event_time=datetime(2030, 1, 1, 18, 0),
+            event_location="Hà Nội",
+            schedule=[{"time": "18:00", "label": "Check-in"}, {"time": "19:00", "label": "Khai mạc"}],
+        )
+        db.add_all([admin, tpl])
+        db.flush()
+        template_content.version_id(db, tpl)
+
+        slugs: list[str] = []
+        # In the past, so writes made during a run move max(updated_at) (the export ETag).
+        created_at = datetime(2024, 1, 1)
+        for start in range(0, invitations, SEED_CHUNK):
+            rows, responses = [], []
+            for i in range(start, min(start + SEED_CHUNK, invitations)):
+                published = rnd.random() < published_share
+                rsvp, count = RsvpStatus.PENDING, 0
+                if published and rnd.random() < responded_share:
+                    rsvp = rnd.choice([RsvpStatus.ATTENDING, RsvpStatus.DECLINED])
+                    count = rnd.randint(1, 4) if rsvp == RsvpStatus.ATTENDING else 0
+                row = {
+                    "id": uuid.uuid4(),
+                    "template_id": tpl.id,
+                    "template_version_id": tpl.current_version_id,
+                    "recipient_salutation": rnd.choice(["Ông", "Bà"]),
+                    "recipient_name": f"Khách mời {i:06d}",
+                    "recipient_title": rnd.choice(["Giám đốc", "Trưởng phòng", "Chuyên viên"]),
+                    "slug": f"bench-{i:06d}" if published else None,
+                    "status": InvitationStatus.published if published else InvitationStatus.draft,
+                    "rsvp_status": rsvp,
+                    "attendee_count": count,
+                    "created_at": created_at + timedelta(seconds=i),
+                    "updated_at": created_at + timedelta(seconds=i),
+                }
+                rows.append(row)
+                if published:
+                    slugs.append(row["slug"])
+                if rsvp != RsvpStatus.PENDING:
+                    responses.append(
+                        {
+                            "id": uuid.uuid4(),
+                            "invitation_id": row["id"],
+                            "responder_id": row["id"],
+                            "response": rsvp,
+                            "attendee_count": count or (0 if rsvp == RsvpStatus.DECLINED else 1),
+                        }
+                    )
+            db.execute(insert(Invitation), rows)
+            if responses:
+                db.execute(insert(InvitationResponse), responses)
+            invitation_stats.adjust(
+                db,
+                tpl.id,
+                invited=len(rows),
+                pending=sum(r["rsvp_status"] == RsvpStatus.PENDING for r in rows),
+                attending=sum(r["rsvp_status"] == RsvpStatus.ATTENDING for r in rows),
+                declined=sum(r["rsvp_status"] == RsvpStatus.DECLINED for r in rows),
+                headcount=sum(r["attendee_count"] for r in rows),
+            )
+        db.commit()
+        db.execute(text("ANALYZE"))
+        db.commit()
+        token = create_access_token({"sub": admin.username, "ver": admin.token_version or 0}, timedelta(days=1))
+        return Seeded(tpl.id, token, slugs)
+    finally:
+        db.close()
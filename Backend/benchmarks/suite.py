@@ -0,0 +1,273 @@
+"""Backend benchmark suite.
+
+Seeds a scratch Postgres database, drives the real ASGI app in-process through
+httpx, and prints one JSON document with throughput, p50/p95/p99 latency and
+peak RSS per scenario, so runs can be diffed across commits.
+
+Run from Backend/ with DATABASE_URL pointing at a database that may be wiped:
+
+    python -m benchmarks.suite --reset --invitations 20000 --import-rows 50000 \\
+        --output bench.json
+
+Scenarios (select with --scenarios):
+    import           POST /api/invitations/import with an --import-rows xlsx
+    export_xlsx      GET /api/invitations/export, export cache cleared each time
+    export_csv       same, format=csv
+    export_cached    repeated export answered from the export cache
+    list_full        GET /api/invitations/ without a limit
+    list_grid        same, with fields= leaving out content and schedule
+    list_pages       walk the list 50 rows at a time with the keyset cursor
+    slug_reads       concurrent GET /api/invitations/{slug}
+    rsvp_burst       concurrent POST /api/invitations/{slug}/response
+
+The app's env (GUEST_ASYNC_DB, RSVP_WRITE_BEHIND, DB_POOL_SIZE, ...) applies as
+usual. SQLite cannot stand in here: the RSVP upsert and the summary table use
+Postgres-only SQL.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+import httpx
+import openpyxl
+
+from benchmarks.common import RssSampler, Timer, percentiles
+from benchmarks.seed import BACKEND_DIR, Seeded, prepare_database, seed
+
+from app.core import invitation_export
+from app.main import app
+
+SCENARIOS = (
+    "import",
+    "export_xlsx",
+    "export_csv",
+    "export_cached",
+    "list_full",
+    "list_grid",
+    "list_pages",
+    "slug_reads",
+    "rsvp_burst",
+)
+LIST_PAGE_SIZE = 50
+# What the admin grid shows.
+LIST_GRID_FIELDS = (
+    "id,recipient_salutation,recipient_name,recipient_title,slug,status,rsvp_status,"
+    "attendee_count,created_at,responses,attending,attending_people,declined"
+)
+
+
+def _import_workbook(rows: int) -> bytes:
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Guests")
+    ws.append(["Xưng hô", "Họ tên", "Chức danh"])
+    for i in range(rows):
+        ws.append(["Ông" if i % 2 else "Bà", f"Khách nhập {i:06d}", "Chuyên viên"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+async def _sequential(
+    call: Callable[[], Awaitable[httpx.Response]], iterations: int, before: Callable[[], None] | None = None
+) -> tuple[list[float], int, int]:
+    latencies, errors, size = [], 0, 0
+    for _ in range(iterations):
+        if before:
+            before()
+        start = time.perf_counter()
+        r = await call()
+        latencies.append(time.perf_counter() - start)
+        errors += r.status_code >= 400
+        size = len(r.content)
+    return latencies, errors, size
+
+
+async def _concurrent(
+    make_call: Callable[[random.Random], Awaitable[httpx.Response]], requests: int, concurrency: int
+) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker(seed_value: int) -> None:
+        nonlocal errors, remaining
+        rnd = random.Random(seed_value)
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            r = await make_call(rnd)
+            latencies.append(time.perf_counter() - start)
+            errors += r.status_code >= 400
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return latencies, errors
+
+
+def _result(latencies: list[float], errors: int, seconds: float, rss: RssSampler, **extra) -> dict:
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "requests_per_s": round(len(latencies) / seconds, 2) if seconds else 0.0,
+        **percentiles(latencies),
+        "rss_start_mb": round(rss.start_mb, 1),
+        "rss_peak_mb": round(rss.peak_mb, 1),
+        **extra,
+    }
+
+
+async def run_scenario(name: str, client: httpx.AsyncClient, seeded: Seeded, args: argparse.Namespace) -> dict:
+    admin = {"Authorization": f"Bearer {seeded.admin_token}"}
+    slugs = seeded.published_slugs
+
+    # Untimed setup.
+    if name == "import":
+        payload = _import_workbook(args.import_rows)
+    elif name == "export_cached":
+        await client.get("/api/invitations/export", headers=admin)
+
+    with RssSampler() as rss, Timer() as timer:
+        if name == "import":
+            latencies, errors, _ = await _sequential(
+                lambda: client.post(
+                    "/api/invitations/import",
+                    data={"template_id": str(seeded.template_id), "status_value": "published"},
+                    files={"file": ("bench.xlsx", payload)},
+                    headers=admin,
+                ),
+                1,
+            )
+            extra = {"rows": args.import_rows}
+        elif name in ("export_xlsx", "export_csv"):
+            fmt = name.split("_")[1]
+            latencies, errors, size = await _sequential(
+                lambda: client.get("/api/invitations/export", params={"format": fmt}, headers=admin),
+                args.iterations,
+                # Measure generation, not the export cache.
+                before=invitation_export._cache.clear,
+            )
+            extra = {"bytes": size}
+        elif name == "export_cached":
+            latencies, errors, size = await _sequential(
+                lambda: client.get("/api/invitations/export", headers=admin), args.iterations
+            )
+            extra = {"bytes": size}
+        elif name == "list_full":
+            latencies, errors, size = await _sequential(
+                lambda: client.get("/api/invitations/", headers=admin), args.iterations
+            )
+            extra = {"bytes": size}
+        elif name == "list_grid":
+            latencies, errors, size = await _sequential(
+                lambda: client.get("/api/invitations/", params={"fields": LIST_GRID_FIELDS}, headers=admin),
+                args.iterations,
+            )
+            extra = {"bytes": size}
+        elif name == "list_pages":
+            latencies, errors, pages = [], 0, 0
+            for _ in range(args.iterations):
+                cursor = None
+                for _page in range(args.max_pages):
+                    params = {"limit": LIST_PAGE_SIZE, **({"cursor": cursor} if cursor else {})}
+                    start = time.perf_counter()
+                    r = await client.get("/api/invitations/", params=params, headers=admin)
+                    latencies.append(time.perf_counter() - start)
+                    errors += r.status_code >= 400
+                    pages += 1
+                    cursor = r.headers.get("x-next-cursor")
+                    if not cursor:
+                        break
+            extra = {"pages": pages, "page_size": LIST_PAGE_SIZE}
+        elif name == "slug_reads":
+            latencies, errors = await _concurrent(
+                lambda rnd: client.get(f"/api/invitations/{rnd.choice(slugs)}"), args.requests, args.concurrency
+            )
+            extra = {"concurrency": args.concurrency}
+        elif name == "rsvp_burst":
+
+            def answer(rnd: random.Random):
+                body = rnd.choice([{"response": "ATTENDING", "attendee_count": rnd.randint(1, 4)}, {"response": "DECLINED"}])
+                return client.post(f"/api/invitations/{rnd.choice(slugs)}/response", json=body)
+
+            latencies, errors = await _concurrent(answer, args.requests, args.concurrency)
+            extra = {"concurrency": args.concurrency}
+        else:
+            raise ValueError(name)
+
+    return _result(latencies, errors, timer.seconds, rss, **extra)
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    prepare_database(args.reset)
+    seeded = seed(args.invitations)
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for name in args.scenarios:
+                print(f"running {name}...", file=sys.stderr)
+                results[name] = await run_scenario(name, client, seeded, args)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "invitations": args.invitations,
+            "import_rows": args.import_rows,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "env": {k: v for k, v in os.environ.items() if k.startswith(("DB_", "GUEST_", "RSVP_", "INVITATION_", "EXPORT_", "IMPORT_"))},
+        },
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reset", action="store_true", help="empty every table before seeding")
+    parser.add_argument("--invitations", type=int, default=20000, help="invitations to seed")
+    parser.add_argument("--import-rows", type=int, default=50000, help="rows in the imported workbook")
+    parser.add_argument("--iterations", type=int, default=5, help="repetitions of the sequential scenarios")
+    parser.add_argument("--max-pages", type=int, default=100, help="pages walked per list_pages iteration")
+    parser.add_argument("--requests", type=int, default=2000, help="requests in the concurrent scenarios")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--scenarios", type=lambda s: s.split(","), default=list(SCENARIOS))
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()